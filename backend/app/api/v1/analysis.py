@@ -12,7 +12,7 @@ import logging
 from app.services.ml.pattern_matcher import PatternMatcher
 from app.services.ml.anomaly_detector import AnomalyDetector
 from app.services.ml.risk_scorer import RiskScorer
-from app.services.blockchain.etherscan import EtherscanClient
+from app.services.blockchain.etherscan import get_etherscan_client
 from app.services.narrative.narrative_generator import NarrativeGenerator
 
 logger = logging.getLogger(__name__)
@@ -103,7 +103,7 @@ async def analyze_patterns(request: PatternAnalysisRequest):
     """
     try:
         # Initialize clients
-        etherscan_client = EtherscanClient()
+        etherscan_client = get_etherscan_client()
         pattern_matcher = PatternMatcher()
         anomaly_detector = AnomalyDetector()
         risk_scorer = RiskScorer()
@@ -196,7 +196,7 @@ async def generate_narrative(request: NarrativeRequest):
     """
     try:
         # Initialize clients and generators
-        etherscan_client = EtherscanClient()
+        etherscan_client = get_etherscan_client()
         pattern_matcher = PatternMatcher()
         anomaly_detector = AnomalyDetector()
         risk_scorer = RiskScorer()
@@ -350,7 +350,7 @@ async def calculate_risk_score(request: RiskScoreRequest):
     """
     try:
         # Initialize clients
-        etherscan_client = EtherscanClient()
+        etherscan_client = get_etherscan_client()
         pattern_matcher = PatternMatcher()
         anomaly_detector = AnomalyDetector()
         risk_scorer = RiskScorer()
@@ -9,7 +9,7 @@ from typing import Optional, List
 from enum import Enum
 import logging
 
-from app.services.blockchain.etherscan import EtherscanClient
+from app.services.blockchain.etherscan import get_etherscan_client
 from app.services.ml.pattern_matcher import PatternMatcher
 from app.services.ml.anomaly_detector import AnomalyDetector
 from app.services.ml.risk_scorer import RiskScorer
@@ -136,13 +136,13 @@ async def get_address_graph(
             )
         
         # Initialize clients
-        client = EtherscanClient()
+        client = get_etherscan_client()
         pattern_matcher = PatternMatcher()
         anomaly_detector = AnomalyDetector()
         risk_scorer = RiskScorer()
         
         # Get address balance
-        balance = await client.get_address_balance(address)
+        balance = await client.get_address_balance_cached(address)
         logger.info(f"Address {address} balance: {balance} ETH")
         
         # Get transactions for the address
@@ -400,10 +400,10 @@ async def get_transaction_detail(
             )
         
         # Initialize Etherscan client
-        client = EtherscanClient()
+        client = get_etherscan_client()
         
         # Get transaction details
-        tx = await client.get_transaction_details(tx_hash)
+        tx = await client.get_transaction_details_cached(tx_hash)
         
         if not tx:
             raise HTTPException(
@@ -51,6 +51,11 @@ class Settings(BaseSettings):
     def DATABASE_URL(self) -> str:
         return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
     
+    @property
+    def SYNC_DATABASE_URL(self) -> str:
+        # Celery ワーカー等の同期処理用（psycopg2）
+        return f"postgresql+psycopg2://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+    
     # Neo4j設定
     NEO4J_URI: str = "bolt://localhost:7687"
     NEO4J_USER: str = "neo4j"
@@ -68,8 +73,14 @@ class Settings(BaseSettings):
             return f"redis://:{self.REDIS_PASSWORD}@{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
     
+    # キャッシュ設定（memory: プロセス内, redis: 全ワーカーで共有）
+    CACHE_BACKEND: str = "memory"
+    
     # ブロックチェーンAPI設定
     ETHERSCAN_API_KEY: Optional[str] = None
+    ETHERSCAN_RATE_LIMIT: float = 5.0  # リクエスト/秒（無料枠は5、0で無制限）
+    BALANCE_CACHE_TTL: int = 2  # 残高キャッシュの有効期間（秒）
+    TX_DETAILS_CACHE_TTL: int = 6 * 60 * 60  # 確定済みトランザクションのキャッシュ有効期間（秒）
     INFURA_PROJECT_ID: Optional[str] = None
     ALCHEMY_API_KEY: Optional[str] = None
     
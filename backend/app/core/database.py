@@ -4,6 +4,7 @@ Database configuration and session management
 """
 
 from typing import AsyncGenerator
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from neo4j import AsyncGraphDatabase
@@ -30,6 +31,10 @@ AsyncSessionLocal = async_sessionmaker(
 
 Base = declarative_base()
 
+# created_at 等のサーバー側デフォルト（UTC、タイムゾーンなし）
+# ORM で使う場合は eager_defaults で INSERT ... RETURNING により値を取得する
+SERVER_UTCNOW = text("timezone('utc', now())")
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
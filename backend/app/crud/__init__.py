@@ -2,5 +2,6 @@
 CRUD operations for database models
 """
 from .user import user_crud
+from .transaction import transaction_crud, copy_transactions
 
-__all__ = ["user_crud"]
+__all__ = ["user_crud", "transaction_crud", "copy_transactions"]
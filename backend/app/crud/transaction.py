@@ -0,0 +1,185 @@
+"""
+CRUD operations for Transaction model
+"""
+import io
+import uuid
+from typing import Iterable, List, Optional
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+import logging
+
+from app.models.investigation import Transaction, create_transaction_partition
+from app.services.blockchain.dto import TxDTO
+
+logger = logging.getLogger(__name__)
+
+
+# Column order shared by the COPY statement and the row encoder
+COPY_COLUMNS = (
+    "id", "tx_hash", "blockchain", "block_number", "from_address", "to_address",
+    "value", "value_f8", "gas_used", "gas_price", "status", "is_suspicious",
+    "timestamp"
+)
+
+# COPY cannot skip existing rows, so it loads a staging table first and the
+# rows are moved over with ON CONFLICT DO NOTHING
+_STAGING_TABLE = "transactions_copy_staging"
+
+CREATE_STAGING_SQL = (
+    f"CREATE TEMP TABLE {_STAGING_TABLE} (LIKE transactions INCLUDING DEFAULTS) ON COMMIT DROP"
+)
+
+COPY_SQL = f"COPY {_STAGING_TABLE} ({', '.join(COPY_COLUMNS)}) FROM STDIN"
+
+MERGE_STAGING_SQL = (
+    f"INSERT INTO transactions ({', '.join(COPY_COLUMNS)}) "
+    f"SELECT {', '.join(COPY_COLUMNS)} FROM {_STAGING_TABLE} "
+    f"ON CONFLICT (tx_hash, timestamp) DO NOTHING"
+)
+
+DROP_STAGING_SQL = f"DROP TABLE {_STAGING_TABLE}"
+
+# PostgreSQL text format escapes (backslash must come first)
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_field(value) -> str:
+    """Encode a single value as a COPY text-format field"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def create_transaction_partitions(connection, transactions: Iterable[TxDTO]) -> None:
+    """
+    Create the monthly partitions that the given transactions fall into
+    
+    Must run before the rows are written. Rows for a month without its own
+    partition land in transactions_default, after which that month's
+    partition can no longer be created.
+    
+    Args:
+        connection: Synchronous SQLAlchemy connection
+        transactions: Transactions about to be written
+    """
+    for month in {tx.timestamp.date().replace(day=1) for tx in transactions}:
+        create_transaction_partition(connection, month)
+
+
+def copy_transactions(connection, transactions: Iterable[TxDTO]) -> int:
+    """
+    Bulk-load transactions with PostgreSQL COPY
+    COPYによるトランザクションの一括投入
+    
+    Intended for the initial history import of an address. Rows are copied
+    into a temporary staging table and then inserted with ON CONFLICT DO
+    NOTHING, so transactions already stored (e.g. shared with an address
+    imported earlier) or repeated across pages are skipped instead of
+    aborting the load.
+    
+    Args:
+        connection: Synchronous SQLAlchemy connection (psycopg2)
+        transactions: Transactions to load
+    
+    Returns:
+        Number of new rows written
+    """
+    buf = io.StringIO()
+    count = 0
+    
+    for tx in transactions:
+        row = (
+            uuid.uuid4(), tx.tx_hash, tx.blockchain, tx.block_number,
+            tx.from_address, tx.to_address, tx.value, float(tx.value),
+            tx.gas_used, tx.gas_price, tx.status, False,
+            tx.timestamp
+        )
+        buf.write("\t".join(_copy_field(v) for v in row))
+        buf.write("\n")
+        count += 1
+    
+    if not count:
+        return 0
+    
+    buf.seek(0)
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute(CREATE_STAGING_SQL)
+        cursor.copy_expert(COPY_SQL, buf)
+        cursor.execute(MERGE_STAGING_SQL)
+        inserted = cursor.rowcount
+        cursor.execute(DROP_STAGING_SQL)
+    finally:
+        cursor.close()
+    
+    logger.info(f"Copied {inserted} new transactions ({count - inserted} already stored)")
+    return inserted
+
+
+class TransactionCRUD:
+    """
+    CRUD operations for Transaction model
+    トランザクションモデルのCRUD操作
+    """
+    
+    # Rows per INSERT statement (keeps bind parameters well under the 32767 limit)
+    BATCH_SIZE = 1000
+    
+    async def bulk_insert(
+        self,
+        db: AsyncSession,
+        transactions: List[TxDTO],
+        batch_size: Optional[int] = None
+    ) -> int:
+        """
+        Insert transactions in batched multi-row INSERT statements
+        
+        Rows that already exist are skipped, which makes this suitable for
+        incremental syncs where the row count is small. The monthly
+        partitions for the rows are created first.
+        
+        Args:
+            db: Database session
+            transactions: Transactions to insert
+            batch_size: Rows per statement (defaults to BATCH_SIZE)
+        
+        Returns:
+            Number of rows submitted
+        """
+        batch_size = batch_size or self.BATCH_SIZE
+        
+        await db.run_sync(
+            lambda session: create_transaction_partitions(session.connection(), transactions)
+        )
+        
+        for i in range(0, len(transactions), batch_size):
+            values = [
+                {
+                    "tx_hash": tx.tx_hash,
+                    "blockchain": tx.blockchain,
+                    "block_number": tx.block_number,
+                    "from_address": tx.from_address,
+                    "to_address": tx.to_address,
+                    "value": tx.value,
+                    "value_f8": float(tx.value),
+                    "gas_used": tx.gas_used,
+                    "gas_price": tx.gas_price,
+                    "status": tx.status,
+                    "timestamp": tx.timestamp,
+                }
+                for tx in transactions[i:i + batch_size]
+            ]
+            stmt = insert(Transaction).values(values).on_conflict_do_nothing(
+                constraint="uq_transactions_tx_hash_timestamp"
+            )
+            await db.execute(stmt)
+        
+        return len(transactions)
+
+
+transaction_crud = TransactionCRUD()
@@ -104,9 +104,7 @@ class UserCRUD:
                 job_title=job_title,
                 role=role,
                 is_active=True,
-                is_superuser=False,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
+                is_superuser=False
             )
             
             db.add(user)
@@ -15,6 +15,9 @@ from loguru import logger
 from app.core.config import settings
 from app.core.database import engine, Base
 from app.api.v1 import auth, graph, report, analysis
+from app.services.blockchain.etherscan import close_etherscan_client
+from app.services.audit.audit_logger import audit_logger
+from app.services.cache.cache_manager import cache_manager
 
 
 @asynccontextmanager
@@ -35,12 +38,23 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
             await conn.run_sync(Base.metadata.create_all)
         logger.info("Database tables created successfully")
     
+    # 監査ログのバッチ書き込み開始
+    audit_logger.start(engine)
+    
+    # 期限切れキャッシュのバックグラウンド削除開始
+    cache_manager.start_cleanup()
+    
     yield
     
     # 終了時処理
     logger.info("🛑 Shutting down MetaSleuth NextGen API...")
+    await audit_logger.stop()
+    logger.info("Audit log flushed")
+    await cache_manager.stop_cleanup()
     await engine.dispose()
     logger.info("Database connections closed")
+    await close_etherscan_client()
+    logger.info("Blockchain API connections closed")
 
 
 # FastAPI アプリケーション初期化
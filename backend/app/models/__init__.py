@@ -5,6 +5,7 @@ Models Package
 
 from app.models.user import User
 from app.models.investigation import Investigation, Report, Address, Transaction
+from app.models.audit import AuditLog
 
 __all__ = [
     "User",
@@ -12,4 +13,5 @@ __all__ = [
     "Report",
     "Address",
     "Transaction",
+    "AuditLog",
 ]
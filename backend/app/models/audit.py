@@ -0,0 +1,38 @@
+"""
+Audit Log Model
+監査ログモデル
+"""
+
+from sqlalchemy import Column, String, Boolean, DateTime, JSON
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+from app.core.database import Base
+
+
+class AuditLog(Base):
+    """監査ログモデル（AuditLogger がバッチで書き込む）"""
+    
+    __tablename__ = "audit_logs"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    
+    # イベント情報
+    timestamp = Column(DateTime, index=True, nullable=False)
+    action = Column(String(100), index=True, nullable=False)
+    level = Column(String(20), nullable=False)  # info, warning, critical
+    success = Column(Boolean, default=True, nullable=False)
+    
+    # 実行者情報
+    user_id = Column(String(255), index=True, nullable=True)
+    user_email = Column(String(255), nullable=True)
+    ip_address = Column(String(50), nullable=True)
+    
+    # 対象リソース
+    resource_type = Column(String(100), nullable=True)
+    resource_id = Column(String(255), nullable=True)
+    
+    details = Column(JSON, nullable=True)
+    
+    def __repr__(self) -> str:
+        return f"<AuditLog {self.action} at {self.timestamp}>"
\ No newline at end of file
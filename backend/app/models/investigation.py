@@ -3,19 +3,27 @@ Investigation Models
 調査関連モデル
 """
 
-from datetime import datetime
-from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, ForeignKey, Text, JSON
+from datetime import datetime, date, timedelta
+from sqlalchemy import (
+    Column, String, Integer, Float, Numeric, Boolean, DateTime, ForeignKey, Text, JSON,
+    DDL, Index, UniqueConstraint, event, text
+)
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 import uuid
 
-from app.core.database import Base
+from app.core.database import Base, SERVER_UTCNOW
+
+
+# トークン金額（wei単位の精度を保持するため倍精度浮動小数点ではなく固定小数点）
+TokenAmount = Numeric(38, 18)
 
 
 class Investigation(Base):
     """調査案件モデル"""
     
     __tablename__ = "investigations"
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -37,14 +45,14 @@ class Investigation(Base):
     risk_level = Column(String(50), nullable=True)  # high, medium, low, none
     total_transactions = Column(Integer, default=0)
     total_addresses = Column(Integer, default=0)
-    total_volume = Column(Float, default=0.0)
+    total_volume = Column(TokenAmount, default=0)
     
     # 検出されたパターン
     detected_patterns = Column(JSON, nullable=True)
     
     # タイムスタンプ
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=SERVER_UTCNOW, nullable=False)
+    updated_at = Column(DateTime, server_default=SERVER_UTCNOW, onupdate=datetime.utcnow, nullable=False)
     completed_at = Column(DateTime, nullable=True)
     
     # リレーション
@@ -59,6 +67,7 @@ class Report(Base):
     """レポートモデル"""
     
     __tablename__ = "reports"
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     investigation_id = Column(UUID(as_uuid=True), ForeignKey("investigations.id"), nullable=False)
@@ -83,10 +92,10 @@ class Report(Base):
     timestamp = Column(DateTime, nullable=True)
     
     # メタデータ
-    metadata = Column(JSON, nullable=True)
+    metadata_ = Column("metadata", JSON, nullable=True)  # "metadata" は Declarative API の予約名
     
     # タイムスタンプ
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=SERVER_UTCNOW, nullable=False)
     completed_at = Column(DateTime, nullable=True)
     
     # リレーション
@@ -100,6 +109,7 @@ class Address(Base):
     """ブロックチェーンアドレスモデル"""
     
     __tablename__ = "addresses"
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
@@ -118,41 +128,62 @@ class Address(Base):
     sanctioned_lists = Column(JSON, nullable=True)
     
     # 統計情報
-    balance = Column(Float, nullable=True)
-    total_received = Column(Float, nullable=True)
-    total_sent = Column(Float, nullable=True)
+    balance = Column(TokenAmount, nullable=True)
+    total_received = Column(TokenAmount, nullable=True)
+    total_sent = Column(TokenAmount, nullable=True)
     transaction_count = Column(Integer, default=0)
     
     # タイムスタンプ
     first_seen = Column(DateTime, nullable=True)
     last_seen = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=SERVER_UTCNOW, nullable=False)
+    updated_at = Column(DateTime, server_default=SERVER_UTCNOW, onupdate=datetime.utcnow, nullable=False)
     
     # メタデータ
-    metadata = Column(JSON, nullable=True)
+    metadata_ = Column("metadata", JSON, nullable=True)  # "metadata" は Declarative API の予約名
     
     def __repr__(self) -> str:
         return f"<Address {self.address[:10]}...>"
 
 
 class Transaction(Base):
-    """トランザクションモデル"""
+    """
+    トランザクションモデル
+    
+    timestamp の月単位でレンジパーティション化されている。
+    PostgreSQL の制約上、主キーと一意制約にはパーティションキーを含める。
+    
+    Base.metadata.create_all は既存の非パーティションの transactions テーブルを
+    変換しないため、パーティション化以前に作成された DB ではテーブルの再作成
+    （新しいスキーマ）が必要。
+    """
     
     __tablename__ = "transactions"
+    __table_args__ = (
+        UniqueConstraint("tx_hash", "timestamp", name="uq_transactions_tx_hash_timestamp"),
+        # 追記型の時系列データのため btree より桁違いに小さい BRIN を使用
+        Index("ix_tx_ts_brin", "timestamp", postgresql_using="brin"),
+        # アドレスは等価検索のみなので hash インデックス（各パーティションに作成される）
+        Index("ix_tx_from_address_hash", "from_address", postgresql_using="hash"),
+        Index("ix_tx_to_address_hash", "to_address", postgresql_using="hash"),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # トランザクション情報
-    tx_hash = Column(String(255), unique=True, index=True, nullable=False)
+    tx_hash = Column(String(255), nullable=False)
     blockchain = Column(String(50), nullable=False)
     block_number = Column(Integer, nullable=True)
     block_hash = Column(String(255), nullable=True)
     
     # 送受信情報
-    from_address = Column(String(255), index=True, nullable=False)
-    to_address = Column(String(255), index=True, nullable=True)
-    value = Column(Float, nullable=False)
+    from_address = Column(String(255), nullable=False)
+    to_address = Column(String(255), nullable=True)
+    value = Column(TokenAmount, nullable=False)
+    # 範囲検索用の非正規化カラム（厳密な計算・エクスポートには value を使用）
+    value_f8 = Column(Float, index=True, nullable=False)
     
     # ガス情報
     gas_used = Column(Integer, nullable=True)
@@ -162,12 +193,52 @@ class Transaction(Base):
     status = Column(String(50), nullable=True)  # success, failed, pending
     is_suspicious = Column(Boolean, default=False)
     
-    # タイムスタンプ
-    timestamp = Column(DateTime, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # タイムスタンプ（パーティションキー）
+    timestamp = Column(DateTime, primary_key=True, nullable=False)
+    created_at = Column(DateTime, server_default=SERVER_UTCNOW, nullable=False)
     
     # メタデータ
-    metadata = Column(JSON, nullable=True)
+    metadata_ = Column("metadata", JSON, nullable=True)  # "metadata" は Declarative API の予約名
+    
+    @validates("value")
+    def _sync_value_f8(self, key, value):
+        """value 更新時に value_f8 を同期"""
+        self.value_f8 = float(value) if value is not None else None
+        return value
     
     def __repr__(self) -> str:
         return f"<Transaction {self.tx_hash[:10]}...>"
+
+
+# 月次パーティションが未作成の期間の行を受け止めるデフォルトパーティション
+event.listen(
+    Transaction.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS transactions_default PARTITION OF transactions DEFAULT")
+    .execute_if(dialect="postgresql"),
+)
+
+
+def create_transaction_partition(connection, month: date) -> str:
+    """
+    transactions の月次パーティションを作成（既存の場合は何もしない）
+    
+    該当月の行がデフォルトパーティションに入る前に作成しておくこと。
+    
+    Args:
+        connection: 同期 SQLAlchemy コネクション
+        month: 対象月（日付部分は無視）
+    
+    Returns:
+        パーティションテーブル名
+    """
+    start = month.replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1)
+    name = f"transactions_{start:%Y_%m}"
+    
+    connection.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF transactions "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+    
+    return name
\ No newline at end of file
@@ -8,13 +8,14 @@ from sqlalchemy import Column, String, Boolean, DateTime, Integer
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 
-from app.core.database import Base
+from app.core.database import Base, SERVER_UTCNOW
 
 
 class User(Base):
     """ユーザーモデル"""
     
     __tablename__ = "users"
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email = Column(String(255), unique=True, index=True, nullable=False)
@@ -30,8 +31,8 @@ class User(Base):
     role = Column(String(50), default="user", nullable=False)  # user, admin, investigator
     
     # タイムスタンプ
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=SERVER_UTCNOW, nullable=False)
+    updated_at = Column(DateTime, server_default=SERVER_UTCNOW, onupdate=datetime.utcnow, nullable=False)
     last_login_at = Column(DateTime, nullable=True)
     
     # プロフィール
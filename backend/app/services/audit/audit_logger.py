@@ -3,15 +3,17 @@ Audit Logging Service
 監査ログサービス
 """
 
+import asyncio
 import logging
+import sys
+import uuid
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Union
 from enum import Enum
 import json
 
 logger = logging.getLogger(__name__)
 
-
 class AuditAction(str, Enum):
     """Audit action types"""
     # Authentication
@@ -61,18 +63,112 @@ class AuditLevel(str, Enum):
     CRITICAL = "critical"
 
 
+# Interned plain strings for each enum member, resolved once at import time.
+# Hot-path callers may pass these directly to log_action.
+ACTION_STRINGS: Dict[AuditAction, str] = {a: sys.intern(a.value) for a in AuditAction}
+LEVEL_STRINGS: Dict[AuditLevel, str] = {l: sys.intern(l.value) for l in AuditLevel}
+
+# Single statement shape for audit rows (asyncpg prepares and caches it)
+INSERT_SQL = (
+    "INSERT INTO audit_logs (id, timestamp, action, level, success, user_id, user_email, "
+    "ip_address, resource_type, resource_id, details) "
+    "VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)"
+)
+
+
 class AuditLogger:
     """Audit logging service"""
     
+    # Seconds between background flushes
+    FLUSH_INTERVAL = 1.0
+    
+    # Entries kept in memory before new ones are dropped (DB unavailable)
+    MAX_BUFFER = 10_000
+    
     def __init__(self):
         """Initialize audit logger"""
-        # In production, this should write to a dedicated audit log database
         self.logger = logging.getLogger("audit")
         self.logger.setLevel(logging.INFO)
+        
+        # Entries waiting to be written to the audit_logs table
+        self._buffer: List[Dict[str, Any]] = []
+        self._engine = None
+        self._flusher: Optional[asyncio.Task] = None
+    
+    def start(self, engine) -> None:
+        """
+        Start persisting audit entries to the database in the background
+        
+        Args:
+            engine: Async SQLAlchemy engine (asyncpg)
+        """
+        self._engine = engine
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._run_flusher())
+    
+    async def stop(self) -> None:
+        """Stop the background flusher and write any remaining entries"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+    
+    async def _run_flusher(self) -> None:
+        """Periodically flush buffered entries"""
+        while True:
+            await asyncio.sleep(self.FLUSH_INTERVAL)
+            await self.flush()
+    
+    async def flush(self) -> int:
+        """
+        Write buffered entries to the audit_logs table
+        
+        All rows go through one executemany call, which asyncpg sends as a
+        single pipelined batch of a prepared INSERT.
+        
+        Returns:
+            Number of entries written
+        """
+        if not self._buffer or self._engine is None:
+            return 0
+        
+        batch, self._buffer = self._buffer, []
+        params = [
+            (
+                uuid.uuid4(),
+                e["timestamp"],
+                e["action"],
+                e["level"],
+                e["success"],
+                e["user_id"],
+                e["user_email"],
+                e["ip_address"],
+                e["resource_type"],
+                e["resource_id"],
+                json.dumps(e["details"], ensure_ascii=False)
+            )
+            for e in batch
+        ]
+        
+        try:
+            async with self._engine.begin() as conn:
+                raw = await conn.get_raw_connection()
+                await raw.driver_connection.executemany(INSERT_SQL, params)
+        except Exception as e:
+            logger.error(f"Failed to persist {len(batch)} audit entries: {str(e)}", exc_info=True)
+            # Keep the entries for the next attempt, within the buffer limit
+            self._buffer = (batch + self._buffer)[-self.MAX_BUFFER:]
+            return 0
+        
+        return len(batch)
     
     def log_action(
         self,
-        action: AuditAction,
+        action: Union[AuditAction, str],
         user_id: Optional[str] = None,
         user_email: Optional[str] = None,
         ip_address: Optional[str] = None,
@@ -86,7 +182,7 @@ class AuditLogger:
         Log an audit event
         
         Args:
-            action: Type of action performed
+            action: Type of action performed (enum member or its interned string)
             user_id: User ID who performed the action
             user_email: User email
             ip_address: IP address of the request
@@ -96,16 +192,17 @@ class AuditLogger:
             level: Severity level
             success: Whether the action was successful
         """
+        timestamp = datetime.utcnow()
         audit_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "action": action.value,
+            "timestamp": timestamp.isoformat(),
+            "action": ACTION_STRINGS[action] if isinstance(action, AuditAction) else action,
             "user_id": user_id,
             "user_email": user_email,
             "ip_address": ip_address,
             "resource_type": resource_type,
             "resource_id": resource_id,
             "details": details or {},
-            "level": level.value,
+            "level": LEVEL_STRINGS[level],
             "success": success
         }
         
@@ -119,8 +216,10 @@ class AuditLogger:
         else:
             self.logger.info(log_message)
         
-        # In production, also write to database for querying
-        # await self._save_to_database(audit_entry)
+        # Queue for the database flusher with the same reading as a datetime
+        if self._engine is not None and len(self._buffer) < self.MAX_BUFFER:
+            audit_entry["timestamp"] = timestamp
+            self._buffer.append(audit_entry)
     
     def log_authentication(
         self,
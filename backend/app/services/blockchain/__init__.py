@@ -1,7 +1,16 @@
 """
 Blockchain API integration services
 """
-from .etherscan import EtherscanClient
+from .etherscan import EtherscanClient, get_etherscan_client, close_etherscan_client
 from .base import BlockchainClient
+from .dto import TxDTO
+from .rate_limiter import RateLimiter
 
-__all__ = ["EtherscanClient", "BlockchainClient"]
+__all__ = [
+    "EtherscanClient",
+    "BlockchainClient",
+    "TxDTO",
+    "RateLimiter",
+    "get_etherscan_client",
+    "close_etherscan_client",
+]
@@ -1,17 +1,35 @@
 """
 Base blockchain client interface
 """
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Awaitable, Callable
 from datetime import datetime
+import httpx
+
+from app.core.config import settings
+from app.services.cache.cache_manager import cached
+from .dto import TxDTO
 
 
 class BlockchainClient(ABC):
     """
     Abstract base class for blockchain API clients
     ブロックチェーンAPIクライアントの抽象基底クラス
+    
+    Holds a long-lived HTTP/2 connection pool shared by all requests of the
+    client, so subclasses should issue calls through ``self._get_client()``
+    instead of opening ad-hoc sessions.
     """
     
+    # Blockchain name recorded on DTOs (e.g., "ethereum")
+    BLOCKCHAIN = ""
+    
+    # Upper bound on pages fetched by get_all_transactions when no explicit
+    # max_pages is given (providers rarely return history past this window)
+    DEFAULT_MAX_PAGES = 10
+    
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize blockchain client
@@ -20,6 +38,41 @@ class BlockchainClient(ABC):
             api_key: API key for authentication
         """
         self.api_key = api_key
+        self._client: Optional[httpx.AsyncClient] = None
+        
+        # Address normalization is pure and sees the same few addresses over
+        # and over, so memoize whatever implementation the subclass provides
+        self.format_address = lru_cache(maxsize=10_000)(self.format_address)
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Get the shared HTTP client, creating it on first use
+        
+        Creating it lazily binds the pool to the event loop that actually
+        issues the requests.
+        
+        Returns:
+            HTTP client
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Close the underlying HTTP connection pool"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
     
     @abstractmethod
     async def get_address_balance(self, address: str) -> float:
@@ -34,6 +87,23 @@ class BlockchainClient(ABC):
         """
         pass
     
+    async def get_balances(self, addresses: List[str]) -> Dict[str, float]:
+        """
+        Get the balances of several addresses
+        
+        The default issues one balance request per address; clients whose
+        API supports multi-address queries should override this.
+        
+        Args:
+            addresses: Blockchain addresses
+        
+        Returns:
+            Mapping of formatted address to balance in native token
+        """
+        addresses = list(dict.fromkeys(self.format_address(a) for a in addresses))
+        balances = await asyncio.gather(*(self.get_address_balance(a) for a in addresses))
+        return dict(zip(addresses, balances))
+    
     @abstractmethod
     async def get_address_transactions(
         self,
@@ -58,6 +128,188 @@ class BlockchainClient(ABC):
         """
         pass
     
+    async def get_address_transaction_dtos(
+        self,
+        address: str,
+        start_block: Optional[int] = None,
+        end_block: Optional[int] = None,
+        page: int = 1,
+        page_size: int = 100
+    ) -> List[TxDTO]:
+        """
+        Get transactions for an address as typed DTOs
+        
+        Subclasses may override this to build DTOs straight from the raw API
+        response instead of going through the dictionary format.
+        
+        Args:
+            address: Blockchain address
+            start_block: Starting block number
+            end_block: Ending block number
+            page: Page number for pagination
+            page_size: Number of transactions per page
+        
+        Returns:
+            List of transaction DTOs
+        """
+        transactions = await self.get_address_transactions(
+            address, start_block=start_block, end_block=end_block, page=page, page_size=page_size
+        )
+        return [TxDTO.from_dict(tx, self.BLOCKCHAIN) for tx in transactions]
+    
+    async def get_all_transactions(
+        self,
+        address: str,
+        max_pages: Optional[int] = None,
+        concurrency: int = 10,
+        page_size: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the full transaction history of an address
+        
+        Args:
+            address: Blockchain address
+            max_pages: Maximum number of pages to fetch
+            concurrency: Maximum number of concurrent page requests
+            page_size: Number of transactions per page
+        
+        Returns:
+            List of transaction dictionaries in page order
+        """
+        return await self._fetch_all_pages(
+            lambda page: self.get_address_transactions(address, page=page, page_size=page_size),
+            max_pages, concurrency, page_size
+        )
+    
+    async def get_all_transaction_dtos(
+        self,
+        address: str,
+        max_pages: Optional[int] = None,
+        concurrency: int = 10,
+        page_size: int = 1000
+    ) -> List[TxDTO]:
+        """
+        Get the full transaction history of an address as typed DTOs
+        
+        Args:
+            address: Blockchain address
+            max_pages: Maximum number of pages to fetch
+            concurrency: Maximum number of concurrent page requests
+            page_size: Number of transactions per page
+        
+        Returns:
+            List of transaction DTOs in page order
+        """
+        return await self._fetch_all_pages(
+            lambda page: self.get_address_transaction_dtos(address, page=page, page_size=page_size),
+            max_pages, concurrency, page_size
+        )
+    
+    async def get_all_token_transfers(
+        self,
+        address: str,
+        contract_address: Optional[str] = None,
+        max_pages: Optional[int] = None,
+        concurrency: int = 10,
+        page_size: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """
+        Get all token transfer events for an address
+        
+        Args:
+            address: Blockchain address
+            contract_address: Token contract address (optional filter)
+            max_pages: Maximum number of pages to fetch
+            concurrency: Maximum number of concurrent page requests
+            page_size: Number of transfers per page
+        
+        Returns:
+            List of token transfer dictionaries in page order
+        """
+        return await self._fetch_all_pages(
+            lambda page: self.get_token_transfers(
+                address, contract_address=contract_address, page=page, page_size=page_size
+            ),
+            max_pages, concurrency, page_size
+        )
+    
+    async def get_all_internal_transactions(
+        self,
+        address: str,
+        max_pages: Optional[int] = None,
+        concurrency: int = 10,
+        page_size: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """
+        Get all internal transactions for an address
+        
+        Args:
+            address: Blockchain address
+            max_pages: Maximum number of pages to fetch
+            concurrency: Maximum number of concurrent page requests
+            page_size: Number of transactions per page
+        
+        Returns:
+            List of internal transaction dictionaries in page order
+        """
+        return await self._fetch_all_pages(
+            lambda page: self.get_internal_transactions(address, page=page, page_size=page_size),
+            max_pages, concurrency, page_size
+        )
+    
+    async def _fetch_all_pages(
+        self,
+        fetch_page: Callable[[int], Awaitable[List[Dict[str, Any]]]],
+        max_pages: Optional[int],
+        concurrency: int,
+        page_size: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch consecutive pages of a paginated endpoint
+        
+        Page 1 is fetched first; if it is full, the remaining pages are
+        requested concurrently with at most ``concurrency`` requests in flight.
+        Pages after the first short (last) page are skipped.
+        
+        Args:
+            fetch_page: Coroutine function returning the items of a page
+            max_pages: Maximum number of pages to fetch
+            concurrency: Maximum number of concurrent page requests
+            page_size: Number of items per page
+        
+        Returns:
+            Items of all pages in page order
+        """
+        first_page = await fetch_page(1)
+        last_page = max_pages or self.DEFAULT_MAX_PAGES
+        
+        if len(first_page) < page_size or last_page <= 1:
+            return first_page
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        stop_after = last_page
+        
+        async def fetch(page: int) -> List[Dict[str, Any]]:
+            nonlocal stop_after
+            async with semaphore:
+                if page > stop_after:
+                    return []
+                
+                items = await fetch_page(page)
+                if len(items) < page_size:
+                    stop_after = min(stop_after, page)
+                return items
+        
+        pages = await asyncio.gather(*(fetch(p) for p in range(2, last_page + 1)))
+        
+        all_items = list(first_page)
+        for items in pages:
+            all_items.extend(items)
+            if len(items) < page_size:
+                break
+        
+        return all_items
+    
     @abstractmethod
     async def get_transaction_details(self, tx_hash: str) -> Dict[str, Any]:
         """
@@ -71,6 +323,46 @@ class BlockchainClient(ABC):
         """
         pass
     
+    @cached(
+        ttl=settings.TX_DETAILS_CACHE_TTL,
+        prefix="tx_details",
+        unless=lambda tx: not tx.get("block_number")
+    )
+    async def get_transaction_details_cached(self, tx_hash: str) -> Dict[str, Any]:
+        """
+        Get transaction details, served from the shared cache when possible
+        
+        Only confirmed transactions (with a block number) are cached; they
+        can no longer change, so they are kept for TX_DETAILS_CACHE_TTL.
+        
+        Args:
+            tx_hash: Transaction hash
+        
+        Returns:
+            Transaction details dictionary
+        """
+        return await self.get_transaction_details(tx_hash)
+    
+    async def get_address_balance_cached(self, address: str) -> float:
+        """
+        Get the balance of an address, cached for BALANCE_CACHE_TTL seconds
+        
+        The address is normalized first, so checksummed and lowercase
+        spellings of the same account share one cache entry.
+        
+        Args:
+            address: Blockchain address
+        
+        Returns:
+            Balance in native token (ETH, BTC, etc.)
+        """
+        return await self._get_address_balance_cached(self.format_address(address))
+    
+    @cached(ttl=settings.BALANCE_CACHE_TTL, prefix="address_balance")
+    async def _get_address_balance_cached(self, address: str) -> float:
+        """Cached balance lookup keyed by the normalized address"""
+        return await self.get_address_balance(address)
+    
     @abstractmethod
     async def get_token_transfers(
         self,
@@ -0,0 +1,59 @@
+"""
+Typed transfer objects returned by blockchain clients
+ブロックチェーンクライアントが返す型付きデータ転送オブジェクト
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Any, Optional
+
+
+@dataclass(slots=True, frozen=True)
+class TxDTO:
+    """
+    Transaction record matching the columns of the ``transactions`` table
+    
+    Slotted so large pages of transactions do not carry a per-row ``__dict__``.
+    """
+    tx_hash: str
+    blockchain: str
+    block_number: int
+    from_address: str
+    to_address: Optional[str]
+    value: Decimal
+    gas_used: int
+    gas_price: float
+    status: str
+    timestamp: datetime
+    
+    @classmethod
+    def from_dict(cls, tx: Dict[str, Any], blockchain: str) -> "TxDTO":
+        """
+        Build a DTO from a formatted transaction dictionary
+        
+        Args:
+            tx: Transaction dictionary as returned by get_address_transactions
+            blockchain: Blockchain name (e.g., "ethereum")
+        
+        Returns:
+            Transaction DTO
+        """
+        # Prefer the exact wei amount; the float ETH value loses precision
+        value_wei = tx.get("value_wei")
+        if value_wei is not None:
+            value = Decimal(value_wei).scaleb(-18)
+        else:
+            value = Decimal(str(tx.get("value", 0)))
+        
+        return cls(
+            tx_hash=tx.get("hash"),
+            blockchain=blockchain,
+            block_number=tx.get("block_number", 0),
+            from_address=tx.get("from"),
+            to_address=tx.get("to") or None,
+            value=value,
+            gas_used=tx.get("gas_used", 0),
+            gas_price=tx.get("gas_price", 0.0),
+            status="failed" if tx.get("is_error") else "success",
+            timestamp=tx.get("timestamp")
+        )
\ No newline at end of file
@@ -1,17 +1,63 @@
 """
 Etherscan API client for Ethereum blockchain
 """
+import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Union
 import httpx
+import msgspec
+import orjson
 from datetime import datetime
+from decimal import Decimal
 
 from .base import BlockchainClient
+from .dto import TxDTO
+from .rate_limiter import RateLimiter
 from app.core.config import settings
+from app.services.cache.cache_manager import QueryOptimizer, cache_manager, cached
 
 logger = logging.getLogger(__name__)
 
 
+def _hex_int(value: Optional[str]) -> int:
+    """
+    Parse a 0x-prefixed JSON-RPC quantity
+    
+    Pending transactions return null for block fields, which maps to 0.
+    """
+    return int(value, 16) if value else 0
+
+
+class _TxListRow(msgspec.Struct):
+    """Row of the account/txlist response (numeric strings decoded as ints)"""
+    hash: str = ""
+    from_: str = msgspec.field(name="from", default="")
+    to: str = ""
+    value: str = "0"  # kept as the exact wei string
+    blockNumber: int = 0
+    timeStamp: int = 0
+    gasUsed: int = 0
+    gasPrice: int = 0
+    isError: str = "0"
+    txreceipt_status: str = ""
+    input: str = ""
+    contractAddress: str = ""
+    cumulativeGasUsed: int = 0
+    confirmations: int = 0
+
+
+class _TxListResponse(msgspec.Struct):
+    """Envelope of the account/txlist response (result is a message on errors)"""
+    status: str = "0"
+    message: str = ""
+    result: Union[List[_TxListRow], str] = []
+
+
+# Decodes txlist bodies straight into typed rows in one pass; strict=False
+# lets Etherscan's numeric strings convert to int fields
+_TXLIST_DECODER = msgspec.json.Decoder(_TxListResponse, strict=False)
+
+
 class EtherscanClient(BlockchainClient):
     """
     Etherscan API client for querying Ethereum blockchain data
@@ -19,6 +65,20 @@ class EtherscanClient(BlockchainClient):
     """
     
     BASE_URL = "https://api.etherscan.io/api"
+    BLOCKCHAIN = "ethereum"
+    
+    # Requests in flight at once (Etherscan allows 5 calls/sec on free keys)
+    MAX_CONCURRENT_REQUESTS = 5
+    
+    # Addresses per balancemulti call (Etherscan maximum)
+    BALANCE_BATCH_SIZE = 20
+    
+    # Blocks behind the head after which a range is treated as final
+    FINALITY_CONFIRMATIONS = 12
+    
+    # Unit divisors used by the bulk formatters instead of format_amount
+    _WEI = 10 ** 18
+    _GWEI = 10 ** 9
     
     def __init__(self, api_key: Optional[str] = None):
         """
@@ -31,15 +91,18 @@ class EtherscanClient(BlockchainClient):
         
         if not self.api_key:
             logger.warning("Etherscan API key not provided. Rate limits will apply.")
+        
+        self._request_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        self._limiter = RateLimiter(settings.ETHERSCAN_RATE_LIMIT)
     
-    async def _make_request(
+    async def _fetch(
         self,
         module: str,
         action: str,
         params: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
+    ) -> bytes:
         """
-        Make API request to Etherscan
+        Send an API request to Etherscan and return the raw response body
         
         Args:
             module: API module (e.g., "account", "transaction")
@@ -47,7 +110,7 @@ class EtherscanClient(BlockchainClient):
             params: Additional parameters
         
         Returns:
-            API response dictionary
+            Response body
         
         Raises:
             httpx.HTTPError: If API request fails
@@ -61,26 +124,60 @@ class EtherscanClient(BlockchainClient):
         if params:
             request_params.update(params)
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(self.BASE_URL, params=request_params)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                # Check for API errors
-                if data.get("status") == "0" and data.get("message") != "No transactions found":
-                    logger.error(f"Etherscan API error: {data.get('result', 'Unknown error')}")
-                    return {"status": "0", "result": [], "message": data.get("message", "")}
-                
-                return data
-                
-            except httpx.HTTPError as e:
-                logger.error(f"HTTP error calling Etherscan API: {str(e)}", exc_info=True)
-                raise
-            except Exception as e:
-                logger.error(f"Unexpected error calling Etherscan API: {str(e)}", exc_info=True)
-                raise
+        try:
+            async with self._request_semaphore, self._limiter:
+                response = await self._get_client().get(self.BASE_URL, params=request_params)
+            response.raise_for_status()
+            
+            return response.content
+        
+        except httpx.HTTPError as e:
+            # Tracebacks only at DEBUG: failures come in bursts when rate limited
+            logger.error(
+                f"HTTP error calling Etherscan API: {str(e)}",
+                exc_info=logger.isEnabledFor(logging.DEBUG)
+            )
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error calling Etherscan API: {str(e)}", exc_info=True)
+            raise
+    
+    @staticmethod
+    def _is_api_error(status: Optional[str], message: Optional[str], result: Any) -> bool:
+        """Check an Etherscan response envelope for an error (logging it)"""
+        if status == "0" and message != "No transactions found":
+            logger.error(f"Etherscan API error: {result or 'Unknown error'}")
+            return True
+        return False
+    
+    async def _make_request(
+        self,
+        module: str,
+        action: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Make API request to Etherscan
+        
+        Args:
+            module: API module (e.g., "account", "transaction")
+            action: API action (e.g., "balance", "txlist")
+            params: Additional parameters
+        
+        Returns:
+            API response dictionary
+        
+        Raises:
+            httpx.HTTPError: If API request fails
+        """
+        # Decode the raw body with orjson (token transfer pages can be megabytes)
+        data = orjson.loads(await self._fetch(module, action, params))
+        
+        # Check for API errors
+        if self._is_api_error(data.get("status"), data.get("message"), data.get("result")):
+            return {"status": "0", "result": [], "message": data.get("message", "")}
+        
+        return data
     
     async def get_address_balance(self, address: str) -> float:
         """
@@ -106,6 +203,43 @@ class EtherscanClient(BlockchainClient):
         
         return 0.0
     
+    async def get_balances(self, addresses: List[str]) -> Dict[str, float]:
+        """
+        Get the ETH balances of several addresses
+        
+        Uses the balancemulti action, so N addresses cost N / 20 requests.
+        
+        Args:
+            addresses: Ethereum addresses
+        
+        Returns:
+            Mapping of lowercase address to balance in ETH (addresses missing
+            from a failed batch are omitted)
+        """
+        addresses = list(dict.fromkeys(self.format_address(a) for a in addresses))
+        
+        async def fetch_batch(batch: List[str]) -> List[Dict[str, str]]:
+            response = await self._make_request(
+                module="account",
+                action="balancemulti",
+                params={"address": ",".join(batch), "tag": "latest"}
+            )
+            if response.get("status") == "1":
+                return response.get("result", [])
+            return []
+        
+        results = await asyncio.gather(*(
+            fetch_batch(batch)
+            for batch in QueryOptimizer.batch_process(addresses, self.BALANCE_BATCH_SIZE)
+        ))
+        
+        wei = self._WEI
+        return {
+            item["account"].lower(): int(item["balance"]) / wei
+            for batch in results
+            for item in batch
+        }
+    
     async def get_address_transactions(
         self,
         address: str,
@@ -127,6 +261,118 @@ class EtherscanClient(BlockchainClient):
         Returns:
             List of transaction dictionaries
         """
+        # Pages of a finalized block range never change, so cache them long-term
+        cache_key = None
+        if end_block is not None and await self._is_finalized(end_block):
+            cache_key = cache_manager._generate_key(
+                "txlist", self.format_address(address), start_block, end_block, page, page_size
+            )
+            cached_page = await cache_manager.aget(cache_key)
+            if cached_page is not None:
+                return cached_page
+        
+        transactions = self._format_transactions(
+            await self._get_txlist(address, start_block, end_block, page, page_size)
+        )
+        
+        # Empty pages are not cached: API errors also come back empty
+        if cache_key is not None and transactions:
+            await cache_manager.aset(cache_key, transactions, settings.TX_DETAILS_CACHE_TTL)
+        
+        return transactions
+    
+    @cached(ttl=12, prefix="eth_block_number")
+    async def get_latest_block_number(self) -> int:
+        """
+        Get the latest block number (cached for about one block time)
+        
+        Returns:
+            Latest block number (0 if unavailable)
+        """
+        response = await self._make_request(module="proxy", action="eth_blockNumber")
+        return _hex_int(response.get("result"))
+    
+    async def _is_finalized(self, end_block: int) -> bool:
+        """
+        Check whether a block is at least FINALITY_CONFIRMATIONS behind the head
+        
+        Args:
+            end_block: Block number
+        
+        Returns:
+            True if data up to the block can no longer change
+        """
+        latest = await self.get_latest_block_number()
+        return 0 < end_block <= latest - self.FINALITY_CONFIRMATIONS
+    
+    async def get_address_transaction_dtos(
+        self,
+        address: str,
+        start_block: Optional[int] = None,
+        end_block: Optional[int] = None,
+        page: int = 1,
+        page_size: int = 100
+    ) -> List[TxDTO]:
+        """
+        Get normal transactions for an address as typed DTOs
+        
+        Args:
+            address: Ethereum address
+            start_block: Starting block number
+            end_block: Ending block number
+            page: Page number for pagination
+            page_size: Number of transactions per page (max 10000)
+        
+        Returns:
+            List of transaction DTOs
+        """
+        transactions = await self._get_txlist(address, start_block, end_block, page, page_size)
+        return self._format_transaction_dtos(transactions)
+    
+    async def iter_address_transactions(
+        self,
+        address: str,
+        start_block: Optional[int] = None,
+        end_block: Optional[int] = None,
+        page: int = 1,
+        page_size: int = 100
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Get normal transactions for an address, formatted lazily
+        
+        The page is fetched eagerly, but each row is only converted when the
+        iterator reaches it, so callers that stop early or filter on a few
+        rows skip the per-row formatting cost.
+        
+        Args:
+            address: Ethereum address
+            start_block: Starting block number
+            end_block: Ending block number
+            page: Page number for pagination
+            page_size: Number of transactions per page (max 10000)
+        
+        Returns:
+            Iterator of transaction dictionaries
+        """
+        transactions = await self._get_txlist(address, start_block, end_block, page, page_size)
+        return self._iter_transactions(transactions)
+    
+    async def _get_txlist(
+        self,
+        address: str,
+        start_block: Optional[int],
+        end_block: Optional[int],
+        page: int,
+        page_size: int
+    ) -> List[_TxListRow]:
+        """
+        Fetch one page of normal transactions from the txlist action
+        
+        The body is decoded directly into typed rows with msgspec.
+        
+        Returns:
+            Transaction rows (empty on error)
+        """
         address = self.format_address(address)
         
         params = {
@@ -138,15 +384,14 @@ class EtherscanClient(BlockchainClient):
             "sort": "desc"  # Most recent first
         }
         
-        response = await self._make_request(
-            module="account",
-            action="txlist",
-            params=params
+        response = _TXLIST_DECODER.decode(
+            await self._fetch(module="account", action="txlist", params=params)
         )
         
-        if response.get("status") == "1":
-            transactions = response.get("result", [])
-            return self._format_transactions(transactions)
+        if self._is_api_error(response.status, response.message, response.result):
+            return []
+        if response.status == "1" and isinstance(response.result, list):
+            return response.result
         
         return []
     
@@ -302,38 +547,117 @@ class EtherscanClient(BlockchainClient):
         
         return []
     
-    def _format_transactions(self, transactions: List[Dict]) -> List[Dict[str, Any]]:
+    async def get_all_erc721_transfers(
+        self,
+        address: str,
+        contract_address: Optional[str] = None,
+        max_pages: Optional[int] = None,
+        concurrency: int = 10,
+        page_size: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """
+        Get all ERC-721 (NFT) transfer events for an address
+        
+        Args:
+            address: Ethereum address
+            contract_address: NFT contract address (optional filter)
+            max_pages: Maximum number of pages to fetch
+            concurrency: Maximum number of concurrent page requests
+            page_size: Number of transfers per page
+        
+        Returns:
+            List of NFT transfer dictionaries in page order
+        """
+        return await self._fetch_all_pages(
+            lambda page: self.get_erc721_transfers(
+                address, contract_address=contract_address, page=page, page_size=page_size
+            ),
+            max_pages, concurrency, page_size
+        )
+    
+    def _format_transactions(self, transactions: List[_TxListRow]) -> List[Dict[str, Any]]:
         """
         Format transaction list to standardized format
         
         Args:
-            transactions: Raw transaction list from API
+            transactions: Decoded txlist rows
         
         Returns:
             Formatted transaction list
         """
-        formatted = []
+        format_transaction = self._format_transaction
+        return [format_transaction(tx) for tx in transactions]
+    
+    def _iter_transactions(self, transactions: List[_TxListRow]) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily format transactions as they are consumed
         
+        Args:
+            transactions: Decoded txlist rows
+        
+        Yields:
+            Formatted transactions
+        """
+        format_transaction = self._format_transaction
         for tx in transactions:
-            formatted.append({
-                "hash": tx.get("hash"),
-                "from": tx.get("from"),
-                "to": tx.get("to"),
-                "value": self.format_amount(tx.get("value", "0"), decimals=18),
-                "value_wei": tx.get("value", "0"),
-                "block_number": int(tx.get("blockNumber", 0)),
-                "timestamp": datetime.fromtimestamp(int(tx.get("timeStamp", 0))),
-                "gas_used": int(tx.get("gasUsed", 0)),
-                "gas_price": self.format_amount(tx.get("gasPrice", "0"), decimals=9),  # Gwei
-                "is_error": tx.get("isError") == "1",
-                "tx_receipt_status": tx.get("txreceipt_status") == "1",
-                "input": tx.get("input", ""),
-                "contract_address": tx.get("contractAddress", ""),
-                "cumulative_gas_used": int(tx.get("cumulativeGasUsed", 0)),
-                "confirmations": int(tx.get("confirmations", 0))
-            })
+            yield format_transaction(tx)
+    
+    def _format_transaction(self, tx: _TxListRow) -> Dict[str, Any]:
+        """
+        Format a single transaction to standardized format
         
-        return formatted
+        Args:
+            tx: Decoded txlist row
+        
+        Returns:
+            Formatted transaction
+        """
+        return {
+            "hash": tx.hash,
+            "from": tx.from_,
+            "to": tx.to,
+            "value": int(tx.value) / self._WEI,
+            "value_wei": tx.value,
+            "block_number": tx.blockNumber,
+            "timestamp": datetime.fromtimestamp(tx.timeStamp),
+            "gas_used": tx.gasUsed,
+            "gas_price": tx.gasPrice / self._GWEI,  # Gwei
+            "is_error": tx.isError == "1",
+            "tx_receipt_status": tx.txreceipt_status == "1",
+            "input": tx.input,
+            "contract_address": tx.contractAddress,
+            "cumulative_gas_used": tx.cumulativeGasUsed,
+            "confirmations": tx.confirmations
+        }
+    
+    def _format_transaction_dtos(self, transactions: List[_TxListRow]) -> List[TxDTO]:
+        """
+        Build transaction DTOs directly from the decoded rows
+        
+        Args:
+            transactions: Decoded txlist rows
+        
+        Returns:
+            List of transaction DTOs
+        """
+        blockchain = self.BLOCKCHAIN
+        gwei = self._GWEI
+        fromtimestamp = datetime.fromtimestamp
+        return [
+            TxDTO(
+                tx_hash=tx.hash,
+                blockchain=blockchain,
+                block_number=tx.blockNumber,
+                from_address=tx.from_,
+                to_address=tx.to or None,
+                value=Decimal(tx.value).scaleb(-18),
+                gas_used=tx.gasUsed,
+                gas_price=tx.gasPrice / gwei,
+                status="failed" if tx.isError == "1" else "success",
+                timestamp=fromtimestamp(tx.timeStamp)
+            )
+            for tx in transactions
+        ]
     
     def _format_transaction_detail(self, tx: Dict) -> Dict[str, Any]:
         """
@@ -345,20 +669,21 @@ class EtherscanClient(BlockchainClient):
         Returns:
             Formatted transaction detail
         """
+        get = tx.get
         return {
-            "hash": tx.get("hash"),
-            "from": tx.get("from"),
-            "to": tx.get("to"),
-            "value": self.format_amount(tx.get("value", "0x0"), decimals=18),
-            "block_number": int(tx.get("blockNumber", "0x0"), 16),
-            "gas": int(tx.get("gas", "0x0"), 16),
-            "gas_price": self.format_amount(tx.get("gasPrice", "0x0"), decimals=9),
-            "input": tx.get("input", ""),
-            "nonce": int(tx.get("nonce", "0x0"), 16),
-            "transaction_index": int(tx.get("transactionIndex", "0x0"), 16),
-            "v": tx.get("v", ""),
-            "r": tx.get("r", ""),
-            "s": tx.get("s", "")
+            "hash": get("hash"),
+            "from": get("from"),
+            "to": get("to"),
+            "value": _hex_int(get("value")) / self._WEI,
+            "block_number": _hex_int(get("blockNumber")),
+            "gas": _hex_int(get("gas")),
+            "gas_price": _hex_int(get("gasPrice")) / self._GWEI,
+            "input": get("input", ""),
+            "nonce": _hex_int(get("nonce")),
+            "transaction_index": _hex_int(get("transactionIndex")),
+            "v": get("v", ""),
+            "r": get("r", ""),
+            "s": get("s", "")
         }
     
     def _format_token_transfers(self, transfers: List[Dict]) -> List[Dict[str, Any]]:
@@ -371,24 +696,28 @@ class EtherscanClient(BlockchainClient):
         Returns:
             Formatted token transfer list
         """
+        gwei = self._GWEI
+        fromtimestamp = datetime.fromtimestamp
         formatted = []
+        append = formatted.append
         
         for transfer in transfers:
             decimals = int(transfer.get("tokenDecimal", 18))
-            formatted.append({
+            value = transfer.get("value", "0")
+            append({
                 "hash": transfer.get("hash"),
                 "from": transfer.get("from"),
                 "to": transfer.get("to"),
-                "value": self.format_amount(transfer.get("value", "0"), decimals=decimals),
-                "value_raw": transfer.get("value", "0"),
+                "value": int(value) / 10 ** decimals,
+                "value_raw": value,
                 "token_name": transfer.get("tokenName", ""),
                 "token_symbol": transfer.get("tokenSymbol", ""),
                 "token_decimal": decimals,
                 "contract_address": transfer.get("contractAddress"),
                 "block_number": int(transfer.get("blockNumber", 0)),
-                "timestamp": datetime.fromtimestamp(int(transfer.get("timeStamp", 0))),
+                "timestamp": fromtimestamp(int(transfer.get("timeStamp", 0))),
                 "gas_used": int(transfer.get("gasUsed", 0)),
-                "gas_price": self.format_amount(transfer.get("gasPrice", "0"), decimals=9),
+                "gas_price": int(transfer.get("gasPrice", 0)) / gwei,
                 "confirmations": int(transfer.get("confirmations", 0))
             })
         
@@ -404,26 +733,27 @@ class EtherscanClient(BlockchainClient):
         Returns:
             Formatted internal transaction list
         """
-        formatted = []
+        wei = self._WEI
+        fromtimestamp = datetime.fromtimestamp
         
-        for tx in transactions:
-            formatted.append({
+        return [
+            {
                 "hash": tx.get("hash"),
                 "from": tx.get("from"),
                 "to": tx.get("to"),
-                "value": self.format_amount(tx.get("value", "0"), decimals=18),
+                "value": int(tx.get("value", 0)) / wei,
                 "value_wei": tx.get("value", "0"),
                 "block_number": int(tx.get("blockNumber", 0)),
-                "timestamp": datetime.fromtimestamp(int(tx.get("timeStamp", 0))),
+                "timestamp": fromtimestamp(int(tx.get("timeStamp", 0))),
                 "gas": int(tx.get("gas", 0)),
                 "gas_used": int(tx.get("gasUsed", 0)),
                 "is_error": tx.get("isError") == "1",
                 "trace_id": tx.get("traceId", ""),
                 "type": tx.get("type", ""),
                 "contract_address": tx.get("contractAddress", "")
-            })
-        
-        return formatted
+            }
+            for tx in transactions
+        ]
     
     def _format_nft_transfers(self, transfers: List[Dict]) -> List[Dict[str, Any]]:
         """
@@ -435,10 +765,11 @@ class EtherscanClient(BlockchainClient):
         Returns:
             Formatted NFT transfer list
         """
-        formatted = []
+        gwei = self._GWEI
+        fromtimestamp = datetime.fromtimestamp
         
-        for transfer in transfers:
-            formatted.append({
+        return [
+            {
                 "hash": transfer.get("hash"),
                 "from": transfer.get("from"),
                 "to": transfer.get("to"),
@@ -447,10 +778,35 @@ class EtherscanClient(BlockchainClient):
                 "token_symbol": transfer.get("tokenSymbol", ""),
                 "contract_address": transfer.get("contractAddress"),
                 "block_number": int(transfer.get("blockNumber", 0)),
-                "timestamp": datetime.fromtimestamp(int(transfer.get("timeStamp", 0))),
+                "timestamp": fromtimestamp(int(transfer.get("timeStamp", 0))),
                 "gas_used": int(transfer.get("gasUsed", 0)),
-                "gas_price": self.format_amount(transfer.get("gasPrice", "0"), decimals=9),
+                "gas_price": int(transfer.get("gasPrice", 0)) / gwei,
                 "confirmations": int(transfer.get("confirmations", 0))
-            })
-        
-        return formatted
+            }
+            for transfer in transfers
+        ]
+
+
+# Process-wide client so the connection pool survives across API requests
+_etherscan_client: Optional[EtherscanClient] = None
+
+
+def get_etherscan_client() -> EtherscanClient:
+    """
+    Get the shared Etherscan client instance
+    
+    Returns:
+        EtherscanClient reusing one connection pool for the whole process
+    """
+    global _etherscan_client
+    if _etherscan_client is None:
+        _etherscan_client = EtherscanClient()
+    return _etherscan_client
+
+
+async def close_etherscan_client():
+    """Close the shared Etherscan client (called on application shutdown)"""
+    global _etherscan_client
+    if _etherscan_client is not None:
+        await _etherscan_client.aclose()
+        _etherscan_client = None
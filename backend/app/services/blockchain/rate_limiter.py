@@ -0,0 +1,62 @@
+"""
+Async token-bucket rate limiter for blockchain API calls
+ブロックチェーンAPI呼び出し用の非同期トークンバケット
+"""
+import asyncio
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Token bucket allowing ``rate`` calls per second with bursts up to ``burst``
+    
+    Callers wait for a token instead of being rejected by the provider and
+    retrying. A rate of 0 or less disables limiting.
+    
+    Usage:
+        limiter = RateLimiter(5)
+        async with limiter:
+            await client.get(...)
+    """
+    
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Initialize rate limiter
+        
+        Args:
+            rate: Allowed calls per second (<= 0 for unlimited)
+            burst: Bucket capacity (defaults to 1, i.e. evenly spaced calls,
+                so no one-second window ever exceeds ``rate`` calls)
+        """
+        self.rate = rate
+        self.capacity = burst or 1
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last update"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it"""
+        if self.rate <= 0:
+            return
+        
+        # Waiters queue on the lock, so tokens are handed out in FIFO order
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        return False
\ No newline at end of file
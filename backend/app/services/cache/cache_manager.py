@@ -3,51 +3,88 @@ Cache Manager for Performance Optimization
 パフォーマンス最適化のためのキャッシュマネージャー
 """
 
-from typing import Any, Optional, Callable
+from typing import Any, Optional, Callable, Iterable, Sequence, Sized
+from collections import OrderedDict, defaultdict, deque
 from functools import wraps
-import hashlib
-import json
+from itertools import islice
+import asyncio
+import heapq
+import inspect
 import logging
-from datetime import datetime, timedelta
+import pickle
+import time
+
+import redis
+import xxhash
+from redis import asyncio as aioredis
+
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
 class CacheManager:
     """
-    Cache manager for application-level caching
-    In production, use Redis or Memcached
+    In-process LRU cache with per-entry TTL
+    
+    Bounded to ``max_entries`` (least recently used entries are evicted).
+    Expiry times are tracked in a min-heap so cleanup_expired only touches
+    entries that have actually expired.
     """
     
-    def __init__(self):
-        """Initialize cache manager"""
-        # In-memory cache for development
-        # In production, replace with Redis client
-        self._cache: dict[str, tuple[Any, datetime]] = {}
+    # Upper bound on how long the cleanup task sleeps between passes
+    CLEANUP_INTERVAL = 60
+    
+    def __init__(self, max_entries: int = 10_000):
+        """
+        Initialize cache manager
+        
+        Args:
+            max_entries: Maximum number of cached entries
+        """
+        # key -> (value, monotonic expiry in ns), ordered from least to most recently used
+        self._cache: OrderedDict[str, tuple[Any, int]] = OrderedDict()
+        # (expiry, key); may hold stale pairs for overwritten or evicted keys
+        self._expiry_heap: list[tuple[int, str]] = []
+        self.max_entries = max_entries
         self.default_ttl = 300  # 5 minutes default TTL
+        self._cleanup_task: Optional[asyncio.Task] = None
     
     def _generate_key(self, prefix: str, *args, **kwargs) -> str:
-        """Generate cache key from function arguments"""
-        key_data = {
-            "prefix": prefix,
-            "args": args,
-            "kwargs": sorted(kwargs.items())
-        }
-        key_str = json.dumps(key_data, sort_keys=True, default=str)
-        return hashlib.md5(key_str.encode()).hexdigest()
+        """
+        Generate cache key from function arguments
+        
+        Hashes the repr of the arguments with 64-bit xxh3, so arguments
+        should have a stable repr (str, int, tuples, ...).
+        """
+        return xxhash.xxh3_64_hexdigest(repr((prefix, args, sorted(kwargs.items()))).encode())
+    
+    async def aget(self, key: str) -> Optional[Any]:
+        """Get value from cache (async interface)"""
+        return self.get(key)
+    
+    async def aset(self, key: str, value: Any, ttl: Optional[int] = None):
+        """Set value in cache (async interface)"""
+        self.set(key, value, ttl)
+    
+    async def adelete(self, key: str):
+        """Delete value from cache (async interface)"""
+        self.delete(key)
     
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
-        if key not in self._cache:
+        entry = self._cache.get(key)
+        if entry is None:
             return None
         
-        value, expiry = self._cache[key]
+        value, expiry = entry
         
         # Check if expired
-        if datetime.utcnow() > expiry:
+        if time.monotonic_ns() > expiry:
             del self._cache[key]
             return None
         
+        self._cache.move_to_end(key)
         logger.debug(f"Cache hit: {key}")
         return value
     
@@ -56,47 +93,278 @@ class CacheManager:
         if ttl is None:
             ttl = self.default_ttl
         
-        expiry = datetime.utcnow() + timedelta(seconds=ttl)
+        expiry = time.monotonic_ns() + int(ttl * 1_000_000_000)
         self._cache[key] = (value, expiry)
+        self._cache.move_to_end(key)
+        heapq.heappush(self._expiry_heap, (expiry, key))
+        
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        
+        # Drop stale heap pairs once they outnumber live entries
+        if len(self._expiry_heap) > 2 * self.max_entries:
+            self._expiry_heap = [(exp, k) for k, (_, exp) in self._cache.items()]
+            heapq.heapify(self._expiry_heap)
+        
         logger.debug(f"Cache set: {key} (TTL: {ttl}s)")
     
     def delete(self, key: str):
         """Delete value from cache"""
-        if key in self._cache:
-            del self._cache[key]
+        if self._cache.pop(key, None) is not None:
             logger.debug(f"Cache deleted: {key}")
     
     def clear(self):
         """Clear all cache"""
         self._cache.clear()
+        self._expiry_heap.clear()
         logger.info("Cache cleared")
     
     def cleanup_expired(self):
         """Remove expired entries"""
-        current_time = datetime.utcnow()
-        expired_keys = [
-            key for key, (_, expiry) in self._cache.items()
-            if current_time > expiry
-        ]
+        current_time = time.monotonic_ns()
+        heap = self._expiry_heap
+        removed = 0
         
-        for key in expired_keys:
-            del self._cache[key]
+        while heap and heap[0][0] <= current_time:
+            expiry, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            # Skip pairs for keys that were since refreshed or evicted
+            if entry is not None and entry[1] == expiry:
+                del self._cache[key]
+                removed += 1
         
-        if expired_keys:
-            logger.info(f"Cleaned up {len(expired_keys)} expired cache entries")
+        if removed:
+            logger.info(f"Cleaned up {removed} expired cache entries")
+    
+    def start_cleanup(self) -> None:
+        """Start removing expired entries in the background"""
+        if self._cleanup_task is None:
+            self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+    
+    async def stop_cleanup(self) -> None:
+        """Stop the background cleanup task"""
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            try:
+                await self._cleanup_task
+            except asyncio.CancelledError:
+                pass
+            self._cleanup_task = None
+    
+    async def _cleanup_loop(self) -> None:
+        """Sleep until the earliest expiry deadline, then drop expired entries"""
+        while True:
+            if self._expiry_heap:
+                delay = (self._expiry_heap[0][0] - time.monotonic_ns()) / 1_000_000_000
+                # Re-check periodically in case a shorter-lived entry was added
+                delay = min(max(delay, 0), self.CLEANUP_INTERVAL)
+            else:
+                delay = self.CLEANUP_INTERVAL
+            await asyncio.sleep(delay)
+            self.cleanup_expired()
+
+
+class RedisCacheManager(CacheManager):
+    """
+    Redis-backed cache manager shared by all worker processes
+    
+    Same interface as CacheManager. Async code should use the a* methods,
+    which go through redis.asyncio; the sync methods use a blocking client.
+    Expiry is handled by Redis (SET ... EX), so cleanup_expired is a no-op.
+    Values are pickled so cached results keep their Python types
+    (e.g., datetimes in transaction details).
+    """
+    
+    # Namespace for cache keys (the Redis DB is shared with Celery)
+    KEY_PREFIX = "cache:"
+    
+    def __init__(self, url: Optional[str] = None, max_connections: int = 50):
+        """
+        Initialize Redis cache manager
+        
+        Args:
+            url: Redis URL (defaults to settings.REDIS_URL)
+            max_connections: Connection pool size per client
+        """
+        url = url or settings.REDIS_URL
+        self.default_ttl = 300
+        self._cleanup_task: Optional[asyncio.Task] = None  # Never started (see start_cleanup)
+        self._client = redis.Redis(
+            connection_pool=redis.ConnectionPool.from_url(url, max_connections=max_connections)
+        )
+        self._aclient = aioredis.Redis(
+            connection_pool=aioredis.ConnectionPool.from_url(url, max_connections=max_connections)
+        )
+    
+    def _load(self, key: str, data: Optional[bytes]) -> Optional[Any]:
+        """Deserialize a cached value"""
+        if data is None:
+            return None
+        logger.debug(f"Cache hit: {key}")
+        return pickle.loads(data)
+    
+    async def aget(self, key: str) -> Optional[Any]:
+        """Get value from cache (async interface)"""
+        return self._load(key, await self._aclient.get(self.KEY_PREFIX + key))
+    
+    async def aset(self, key: str, value: Any, ttl: Optional[int] = None):
+        """Set value in cache (async interface)"""
+        ttl = ttl or self.default_ttl
+        await self._aclient.set(self.KEY_PREFIX + key, pickle.dumps(value), ex=ttl)
+        logger.debug(f"Cache set: {key} (TTL: {ttl}s)")
+    
+    async def adelete(self, key: str):
+        """Delete value from cache (async interface)"""
+        await self._aclient.delete(self.KEY_PREFIX + key)
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get value from cache"""
+        return self._load(key, self._client.get(self.KEY_PREFIX + key))
+    
+    def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        """Set value in cache"""
+        ttl = ttl or self.default_ttl
+        self._client.set(self.KEY_PREFIX + key, pickle.dumps(value), ex=ttl)
+        logger.debug(f"Cache set: {key} (TTL: {ttl}s)")
+    
+    def delete(self, key: str):
+        """Delete value from cache"""
+        self._client.delete(self.KEY_PREFIX + key)
+        logger.debug(f"Cache deleted: {key}")
+    
+    def clear(self):
+        """Clear all cache entries (only keys in the cache namespace)"""
+        for key in self._client.scan_iter(match=self.KEY_PREFIX + "*", count=1000):
+            self._client.delete(key)
+        logger.info("Cache cleared")
+    
+    def cleanup_expired(self):
+        """No-op: Redis expires entries itself"""
+        pass
+    
+    def start_cleanup(self) -> None:
+        """No-op: Redis expires entries itself"""
+        pass
+    
+    async def stop_cleanup(self) -> None:
+        """No-op: no cleanup task was started"""
+        pass
 
 
 # Global cache manager instance
-cache_manager = CacheManager()
+if settings.CACHE_BACKEND == "redis":
+    cache_manager: CacheManager = RedisCacheManager()
+else:
+    cache_manager = CacheManager()
 
 
-def cached(ttl: Optional[int] = None, prefix: str = ""):
+# Template for wrappers generated by _specialized_wrapper; the key expression
+# and the parameter list are baked in per decorated function. Every name it
+# uses besides the parameters starts with an underscore.
+_WRAPPER_TEMPLATE = """
+{async_}def {name}({params}):
+    _key = {key_expr}
+    _cached_value = {await_}_cache.{get}(_key)
+    if _cached_value is not None:
+        return _cached_value
+    _result = {await_}_func({call_args})
+    if _unless is None or not _unless(_result):
+        {await_}_cache.{set}(_key, _result, _ttl)
+    return _result
+"""
+
+
+def _specialized_wrapper(
+    func: Callable,
+    prefix: str,
+    ttl: Optional[int],
+    unless: Optional[Callable[[Any], bool]],
+    is_method: bool,
+    is_async: bool
+) -> Optional[Callable]:
+    """
+    Generate a caching wrapper specialised to func's signature
+    
+    The generated function takes the same parameters (with the same
+    defaults) and builds its key from them directly, so calls skip the
+    generic *args/**kwargs packing and the sorted(kwargs) step, and
+    positional and keyword calls map to the same key.
+    
+    Returns:
+        The wrapper, or None when the signature needs the generic path
+        (*args, **kwargs, keyword-only or positional-only parameters, or
+        parameter names starting with an underscore, which could shadow
+        the wrapper's own names)
+    """
+    signature = inspect.signature(func)
+    namespace: dict[str, Any] = {
+        "_func": func,
+        "_cache": cache_manager,
+        "_hash": xxhash.xxh3_64_hexdigest,
+        "_type": type,
+        "_repr": repr,
+        "_key_prefix": f"{prefix}:",
+        "_ttl": ttl,
+        "_unless": unless,
+    }
+    
+    params = []
+    for i, parameter in enumerate(signature.parameters.values()):
+        if parameter.kind is not inspect.Parameter.POSITIONAL_OR_KEYWORD or parameter.name.startswith("_"):
+            return None
+        if parameter.default is inspect.Parameter.empty:
+            params.append(parameter.name)
+        else:
+            namespace[f"_default_{i}"] = parameter.default
+            params.append(f"{parameter.name}=_default_{i}")
+    
+    names = list(signature.parameters)
+    key_items = list(names)
+    if is_method:
+        key_items[0] = "_type(self).__name__"
+    
+    # Argument-free calls always map to the same key, so skip hashing:
+    # precompute it for functions, and use the class name for methods
+    if not names:
+        namespace["_cache_key"] = f"{prefix}:{xxhash.xxh3_64_hexdigest(repr(()).encode())}"
+        key_expr = "_cache_key"
+    elif is_method and len(names) == 1:
+        key_expr = "_key_prefix + _type(self).__name__"
+    else:
+        key_expr = "_key_prefix + _hash(_repr(({})).encode())".format(
+            "".join(f"{item}, " for item in key_items)
+        )
+    
+    src = _WRAPPER_TEMPLATE.format(
+        async_="async " if is_async else "",
+        await_="await " if is_async else "",
+        get="aget" if is_async else "get",
+        set="aset" if is_async else "set",
+        name=func.__name__,
+        params=", ".join(params),
+        key_expr=key_expr,
+        call_args=", ".join(names),
+    )
+    exec(src, namespace)
+    return wraps(func)(namespace[func.__name__])
+
+
+def cached(
+    ttl: Optional[int] = None,
+    prefix: str = "",
+    unless: Optional[Callable[[Any], bool]] = None
+):
     """
     Decorator to cache function results
     
+    Methods (first parameter named ``self``) are keyed by the class name
+    instead of the instance, so all instances of a class share entries while
+    different classes (e.g., clients for different chains) never collide.
+    
     Args:
         ttl: Time to live in seconds
         prefix: Cache key prefix
+        unless: Predicate on the result; matching results are not cached
     
     Usage:
         @cached(ttl=600, prefix="blockchain")
@@ -104,34 +372,43 @@ def cached(ttl: Optional[int] = None, prefix: str = ""):
             return await fetch_data(address)
     """
     def decorator(func: Callable):
+        parameters = list(inspect.signature(func).parameters)
+        is_method = bool(parameters) and parameters[0] == "self"
+        is_async = asyncio.iscoroutinefunction(func)
+        
+        # Prefer a wrapper generated for this exact signature
+        specialized = _specialized_wrapper(
+            func, prefix or func.__name__, ttl, unless, is_method, is_async
+        )
+        if specialized is not None:
+            return specialized
+        
+        def make_key(args, kwargs) -> str:
+            if is_method:
+                args = (type(args[0]).__name__,) + args[1:]
+            return cache_manager._generate_key(prefix or func.__name__, *args, **kwargs)
+        
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
             # Generate cache key
-            cache_key = cache_manager._generate_key(
-                prefix or func.__name__,
-                *args,
-                **kwargs
-            )
+            cache_key = make_key(args, kwargs)
             
             # Try to get from cache
-            cached_value = cache_manager.get(cache_key)
+            cached_value = await cache_manager.aget(cache_key)
             if cached_value is not None:
                 return cached_value
             
             # Call function and cache result
             result = await func(*args, **kwargs)
-            cache_manager.set(cache_key, result, ttl)
+            if unless is None or not unless(result):
+                await cache_manager.aset(cache_key, result, ttl)
             
             return result
         
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
             # Generate cache key
-            cache_key = cache_manager._generate_key(
-                prefix or func.__name__,
-                *args,
-                **kwargs
-            )
+            cache_key = make_key(args, kwargs)
             
             # Try to get from cache
             cached_value = cache_manager.get(cache_key)
@@ -140,13 +417,13 @@ def cached(ttl: Optional[int] = None, prefix: str = ""):
             
             # Call function and cache result
             result = func(*args, **kwargs)
-            cache_manager.set(cache_key, result, ttl)
+            if unless is None or not unless(result):
+                cache_manager.set(cache_key, result, ttl)
             
             return result
         
         # Return appropriate wrapper based on function type
-        import asyncio
-        if asyncio.iscoroutinefunction(func):
+        if is_async:
             return async_wrapper
         else:
             return sync_wrapper
@@ -158,25 +435,45 @@ class QueryOptimizer:
     """Query optimization utilities"""
     
     @staticmethod
-    def paginate_results(items: list, page: int = 1, page_size: int = 50):
+    def paginate_results(
+        items: Iterable,
+        page: int = 1,
+        page_size: int = 50,
+        total_items: Optional[int] = None
+    ):
         """
         Paginate results for better performance
         
+        Sequences are sliced. Other iterables (e.g., generators) are not
+        materialized: the page is returned as a lazy islice over them.
+        
         Args:
-            items: List of items to paginate
+            items: Items to paginate (sequence or iterable)
             page: Page number (1-indexed)
             page_size: Items per page
+            total_items: Total item count if already known (e.g., from a
+                COUNT query); skips len() and is needed for iterables
         
         Returns:
-            Paginated results with metadata
+            Paginated results with metadata (page counts are None when the
+            total is unknown)
         """
-        total_items = len(items)
-        total_pages = (total_items + page_size - 1) // page_size
+        if total_items is None and isinstance(items, Sized):
+            total_items = len(items)
         
         start_idx = (page - 1) * page_size
         end_idx = start_idx + page_size
         
-        paginated_items = items[start_idx:end_idx]
+        if isinstance(items, Sequence):
+            paginated_items = items[start_idx:end_idx]
+        else:
+            paginated_items = islice(items, start_idx, end_idx)
+        
+        total_pages = None
+        has_next = None
+        if total_items is not None:
+            total_pages = (total_items + page_size - 1) // page_size
+            has_next = page < total_pages
         
         return {
             "items": paginated_items,
@@ -185,7 +482,7 @@ class QueryOptimizer:
                 "page_size": page_size,
                 "total_items": total_items,
                 "total_pages": total_pages,
-                "has_next": page < total_pages,
+                "has_next": has_next,
                 "has_prev": page > 1
             }
         }
@@ -209,35 +506,41 @@ class QueryOptimizer:
 class PerformanceMonitor:
     """Monitor and log performance metrics"""
     
+    # Measurements kept per operation
+    WINDOW_SIZE = 1000
+    
     def __init__(self):
         """Initialize performance monitor"""
-        self.metrics: dict[str, list[float]] = {}
+        self.metrics: dict[str, deque[float]] = defaultdict(lambda: deque(maxlen=self.WINDOW_SIZE))
+        # Running sum of the measurements currently in each window
+        self._totals: dict[str, float] = defaultdict(float)
     
     def record_execution_time(self, operation: str, duration: float):
         """Record execution time for an operation"""
-        if operation not in self.metrics:
-            self.metrics[operation] = []
+        durations = self.metrics[operation]
         
-        self.metrics[operation].append(duration)
+        # The deque drops its oldest measurement on append once full
+        if len(durations) == durations.maxlen:
+            self._totals[operation] -= durations[0]
         
-        # Keep only last 1000 measurements
-        if len(self.metrics[operation]) > 1000:
-            self.metrics[operation] = self.metrics[operation][-1000:]
+        durations.append(duration)
+        self._totals[operation] += duration
     
     def get_statistics(self, operation: str) -> dict:
         """Get statistics for an operation"""
-        if operation not in self.metrics or not self.metrics[operation]:
+        durations = self.metrics.get(operation)
+        if not durations:
             return {}
         
-        durations = self.metrics[operation]
+        total = self._totals[operation]
         
         return {
             "operation": operation,
             "count": len(durations),
             "min": min(durations),
             "max": max(durations),
-            "avg": sum(durations) / len(durations),
-            "total": sum(durations)
+            "avg": total / len(durations),
+            "total": total
         }
     
     def get_all_statistics(self) -> dict:
@@ -264,13 +567,13 @@ def monitor_performance(operation_name: str):
     def decorator(func: Callable):
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
-            start_time = datetime.utcnow()
+            start_time = time.perf_counter_ns()
             
             try:
                 result = await func(*args, **kwargs)
                 return result
             finally:
-                duration = (datetime.utcnow() - start_time).total_seconds()
+                duration = (time.perf_counter_ns() - start_time) * 1e-9
                 performance_monitor.record_execution_time(operation_name, duration)
                 
                 if duration > 5.0:  # Log slow operations
@@ -280,13 +583,13 @@ def monitor_performance(operation_name: str):
         
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
-            start_time = datetime.utcnow()
+            start_time = time.perf_counter_ns()
             
             try:
                 result = func(*args, **kwargs)
                 return result
             finally:
-                duration = (datetime.utcnow() - start_time).total_seconds()
+                duration = (time.perf_counter_ns() - start_time) * 1e-9
                 performance_monitor.record_execution_time(operation_name, duration)
                 
                 if duration > 5.0:
@@ -294,7 +597,6 @@ def monitor_performance(operation_name: str):
                         f"Slow operation: {operation_name} took {duration:.2f}s"
                     )
         
-        import asyncio
         if asyncio.iscoroutinefunction(func):
             return async_wrapper
         else:
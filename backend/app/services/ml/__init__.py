@@ -4,6 +4,6 @@ Machine Learning and Pattern Recognition Services
 """
 from .pattern_matcher import PatternMatcher
 from .anomaly_detector import AnomalyDetector
-from .risk_scorer import RiskScorer
+from .risk_scorer import RiskScorer, RiskJob
 
-__all__ = ["PatternMatcher", "AnomalyDetector", "RiskScorer"]
+__all__ = ["PatternMatcher", "AnomalyDetector", "RiskScorer", "RiskJob"]
@@ -3,14 +3,250 @@ Anomaly Detector for blockchain transactions
 ブロックチェーン取引の異常検知
 """
 import logging
-from typing import List, Dict, Any, Optional, Tuple
-from datetime import datetime, timedelta
-from collections import defaultdict
-import statistics
+import sys
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from datetime import date, datetime, timedelta
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 import math
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to plain NumPy
+    njit = None
+
 logger = logging.getLogger(__name__)
 
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+_ONE_SECOND = timedelta(seconds=1)
+_SECONDS_PER_DAY = 86400
+
+# Python 3.11+ parses a trailing "Z" itself, so skip the per-call str.replace
+if sys.version_info >= (3, 11):
+    _fromisoformat = datetime.fromisoformat
+else:
+    def _fromisoformat(timestamp: str) -> datetime:
+        return datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+
+# Outliers beyond this |z| are graded "high" instead of "medium"
+_HIGH_Z_SCORE = 4.0
+_Z_SCORE_SEVERITY = ("medium", "high")
+
+# Off-peak hours (1-5 AM) as a slice of the 24-bin hourly histogram
+_OFF_PEAK_HOURS = slice(1, 6)
+
+# Description templates per anomaly type: (Japanese, English)
+_DESCRIPTIONS = {
+    "amount_anomaly": (
+        "通常と大きく異なる取引金額（Z-score: {z_score:.2f}）",
+        "Transaction amount significantly different from normal (Z-score: {z_score:.2f})"
+    ),
+    "frequency_anomaly": (
+        "異常に高い取引頻度（Z-score: {z_score:.2f}）",
+        "Abnormally high transaction frequency (Z-score: {z_score:.2f})"
+    ),
+    "time_pattern_anomaly": (
+        "深夜時間帯（1-5時）に異常に多い取引（{percent:.1f}%）",
+        "Abnormally high activity during off-peak hours 1-5 AM ({percent:.1f}%)"
+    ),
+    "counterparty_concentration": (
+        "特定アドレスとの異常に多い取引（Z-score: {z_score:.2f}）",
+        "Abnormally high concentration with specific address (Z-score: {z_score:.2f})"
+    ),
+    "one_time_large_transaction": (
+        "新規アドレスとの一回限りの大口取引",
+        "One-time large transaction with new address"
+    ),
+}
+
+# Score contribution per anomaly severity
+_SEVERITY_WEIGHTS = {
+    "critical": 1.0,
+    "high": 0.75,
+    "medium": 0.5,
+    "low": 0.25
+}
+_DEFAULT_SEVERITY_WEIGHT = 0.5
+
+
+def _wall_clock_seconds(timestamp: Any) -> int:
+    """
+    Convert a transaction timestamp to seconds since the epoch
+    
+    The timestamp's own wall-clock time is used (any UTC offset is dropped),
+    so day and hour buckets match timestamp.date() and timestamp.hour.
+    
+    Args:
+        timestamp: ISO 8601 string or datetime
+    
+    Returns:
+        Seconds since 1970-01-01T00:00:00
+    """
+    if isinstance(timestamp, str):
+        timestamp = _fromisoformat(timestamp)
+    return (timestamp.replace(tzinfo=None) - _EPOCH) // _ONE_SECOND
+
+
+def _mean_std(values: Sequence[float]) -> Tuple[float, float]:
+    """
+    Mean and population standard deviation of a short sequence
+    
+    Uses math.fsum for both passes, which keeps the accuracy of
+    statistics.mean/pstdev without their exact-fraction arithmetic.
+    
+    Returns:
+        (mean, stdev); both 0.0 for an empty input
+    """
+    n = len(values)
+    if not n:
+        return 0.0, 0.0
+    mean = math.fsum(values) / n
+    return mean, math.sqrt(math.fsum((x - mean) * (x - mean) for x in values) / n)
+
+
+def _zscore_outliers_kernel(
+    values: np.ndarray,
+    threshold: float,
+    two_sided: bool
+) -> Tuple[float, float, np.ndarray]:
+    """
+    Mean, population stdev and indices of z-score outliers (numba kernel)
+    
+    Written as explicit loops so numba can compile each pass into a single
+    vectorised loop.
+    """
+    n = values.shape[0]
+    total = 0.0
+    for i in range(n):
+        total += values[i]
+    mean = total / n
+    
+    sq_total = 0.0
+    for i in range(n):
+        d = values[i] - mean
+        sq_total += d * d
+    stdev = np.sqrt(sq_total / n)
+    
+    out = np.empty(n, np.int64)
+    k = 0
+    if stdev > 0:
+        for i in range(n):
+            z = (values[i] - mean) / stdev
+            if two_sided:
+                z = abs(z)
+            if z > threshold:
+                out[k] = i
+                k += 1
+    return mean, stdev, out[:k]
+
+
+def _zscore_outliers_numpy(
+    values: np.ndarray,
+    threshold: float,
+    two_sided: bool
+) -> Tuple[float, float, np.ndarray]:
+    """NumPy fallback for _zscore_outliers_kernel when numba is unavailable"""
+    mean = values.mean()
+    stdev = values.std()
+    if stdev == 0:
+        return mean, stdev, np.empty(0, np.int64)
+    # One scratch buffer, updated in place, instead of a temporary per step
+    z_scores = np.subtract(values, mean)
+    z_scores /= stdev
+    if two_sided:
+        np.abs(z_scores, out=z_scores)
+    return mean, stdev, np.flatnonzero(z_scores > threshold)
+
+
+# Compiled once per process (and cached on disk across processes)
+if njit is not None:
+    _zscore_outliers = njit(cache=True, fastmath=True, nogil=True)(_zscore_outliers_kernel)
+else:
+    _zscore_outliers = _zscore_outliers_numpy
+
+
+def _describe(
+    anomaly: Dict[str, Any],
+    language: Optional[str],
+    **values: Any
+) -> Dict[str, Any]:
+    """
+    Add the description(s) for an anomaly from its type's templates
+    
+    Args:
+        anomaly: Anomaly dictionary (must contain "type")
+        language: "ja" or "en" to format only that description, None for both
+        **values: Values interpolated into the templates
+    
+    Returns:
+        The same anomaly dictionary
+    """
+    template_ja, template_en = _DESCRIPTIONS[anomaly["type"]]
+    if language != "en":
+        anomaly["description_ja"] = template_ja.format(**values)
+    if language != "ja":
+        anomaly["description_en"] = template_en.format(**values)
+    return anomaly
+
+
+def _to_columns(
+    transactions: List[Dict[str, Any]],
+    address: str
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Split transactions into the per-field arrays used by the detectors
+    
+    Every field is read in a single loop over the transaction dicts.
+    
+    Args:
+        transactions: List of transaction dictionaries
+        address: Target address for analysis
+    
+    Returns:
+        (amounts as float64, wall-clock epoch seconds as int64 for
+        transactions that have a timestamp, lowercased counterparty
+        addresses as an object array)
+    """
+    address_lower = address.lower()
+    amounts = []
+    timestamps = []
+    counterparties = []
+    
+    # Fields are almost always present, so index directly and treat the
+    # rare missing key as the exception (cheaper than dict.get on a hit)
+    for tx in transactions:
+        try:
+            amounts.append(float(tx["value"] or 0))
+        except KeyError:
+            amounts.append(0.0)
+        
+        try:
+            timestamp = tx["timestamp"]
+        except KeyError:
+            timestamp = None
+        if timestamp is not None:
+            timestamps.append(_wall_clock_seconds(timestamp))
+        
+        try:
+            from_addr = (tx["from"] or "").lower()
+        except KeyError:
+            from_addr = ""
+        
+        # Only lowercase "to" when the address is the sender
+        if from_addr == address_lower:
+            counterparties.append((tx.get("to") or "").lower())
+        else:
+            counterparties.append(from_addr)
+    
+    return (
+        np.array(amounts, dtype=np.float64),
+        np.array(timestamps, dtype=np.int64),
+        np.array(counterparties, dtype=object)
+    )
+
 
 class AnomalyDetector:
     """
@@ -18,6 +254,12 @@ class AnomalyDetector:
     統計的手法によるブロックチェーン取引の異常検知
     """
     
+    # Minimum number of transactions needed before running any detector
+    MIN_TRANSACTIONS = 10
+    
+    # Run the detectors concurrently from this many transactions on
+    PARALLEL_MIN_TRANSACTIONS = 50_000
+    
     def __init__(self, z_score_threshold: float = 3.0):
         """
         Initialize anomaly detector
@@ -26,12 +268,20 @@ class AnomalyDetector:
             z_score_threshold: Z-score threshold for anomaly detection (default: 3.0)
         """
         self.z_score_threshold = z_score_threshold
+        self._executor: Optional[ThreadPoolExecutor] = None
         logger.info(f"Initialized AnomalyDetector with z-score threshold: {z_score_threshold}")
     
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool used for large inputs (created on first use)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="anomaly")
+        return self._executor
+    
     def detect_anomalies(
         self,
         transactions: List[Dict[str, Any]],
-        address: str
+        address: str,
+        language: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Detect all types of anomalies in transactions
@@ -39,27 +289,44 @@ class AnomalyDetector:
         Args:
             transactions: List of transaction dictionaries
             address: Target address for analysis
+            language: Only build descriptions in this language (ja/en);
+                both are built when None
         
         Returns:
             List of detected anomalies with details
         """
-        anomalies = []
-        
-        # Amount anomalies
-        amount_anomalies = self._detect_amount_anomalies(transactions, address)
-        anomalies.extend(amount_anomalies)
-        
-        # Frequency anomalies
-        frequency_anomalies = self._detect_frequency_anomalies(transactions, address)
-        anomalies.extend(frequency_anomalies)
+        # Too few transactions for any of the statistics below
+        if len(transactions) < self.MIN_TRANSACTIONS:
+            return []
         
-        # Time pattern anomalies
-        time_anomalies = self._detect_time_anomalies(transactions, address)
-        anomalies.extend(time_anomalies)
+        anomalies = []
         
-        # Counterparty anomalies
-        counterparty_anomalies = self._detect_counterparty_anomalies(transactions, address)
-        anomalies.extend(counterparty_anomalies)
+        # One pass over the transactions into per-field arrays
+        amounts, timestamps, counterparties = _to_columns(transactions, address)
+        
+        # Day/hour buckets are derived arithmetically from the epoch seconds
+        days = timestamps // _SECONDS_PER_DAY
+        hours = (timestamps // 3600) % 24
+        
+        detectors = (
+            (self._detect_amount_anomalies, (transactions, amounts, address, language)),
+            (self._detect_frequency_anomalies, (days, address, language)),
+            (self._detect_time_anomalies, (hours, address, language)),
+            (self._detect_counterparty_anomalies, (counterparties, amounts, address, language)),
+        )
+        
+        if len(transactions) >= self.PARALLEL_MIN_TRANSACTIONS:
+            # The NumPy kernels (and the nogil numba kernel) release the GIL,
+            # so the detectors overlap; results keep the serial order
+            executor = self._get_executor()
+            futures = [executor.submit(detector, *args) for detector, args in detectors]
+            results = [future.result() for future in futures]
+        else:
+            # Thread hand-off costs more than it saves on small inputs
+            results = [detector(*args) for detector, args in detectors]
+        
+        for detector_anomalies in results:
+            anomalies.extend(detector_anomalies)
         
         logger.info(f"Detected {len(anomalies)} anomalies for address {address}")
         return anomalies
@@ -67,123 +334,127 @@ class AnomalyDetector:
     def _detect_amount_anomalies(
         self,
         transactions: List[Dict[str, Any]],
-        address: str
+        amounts: np.ndarray,
+        address: str,
+        language: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Detect anomalous transaction amounts using z-score
         金額の異常検知（Z-scoreを使用）
         """
-        amounts = [tx.get("value", 0) for tx in transactions]
-        
-        if len(amounts) < 10:  # Need sufficient data
+        if len(transactions) < self.MIN_TRANSACTIONS:  # Need sufficient data
             return []
         
-        mean = statistics.mean(amounts)
-        stdev = statistics.pstdev(amounts)
+        mean, stdev, outliers = _zscore_outliers(amounts, self.z_score_threshold, True)
+        mean = float(mean)
+        stdev = float(stdev)
         
-        if stdev == 0:  # All amounts are the same
-            return []
+        # Score and grade only the outliers, in one vector step each
+        outlier_amounts = amounts[outliers]
+        z_scores = (outlier_amounts - mean) / stdev
+        severities = (np.abs(z_scores) > _HIGH_Z_SCORE).view(np.uint8)
         
         anomalies = []
-        for tx in transactions:
-            amount = tx.get("value", 0)
-            z_score = (amount - mean) / stdev
-            
-            if abs(z_score) > self.z_score_threshold:
-                anomalies.append({
-                    "type": "amount_anomaly",
-                    "type_ja": "金額異常",
-                    "type_en": "Amount Anomaly",
-                    "severity": "high" if abs(z_score) > 4.0 else "medium",
-                    "description_ja": f"通常と大きく異なる取引金額（Z-score: {z_score:.2f}）",
-                    "description_en": f"Transaction amount significantly different from normal (Z-score: {z_score:.2f})",
-                    "transaction_hash": tx.get("hash"),
-                    "amount": amount,
-                    "z_score": z_score,
-                    "mean": mean,
-                    "stdev": stdev,
-                    "timestamp": tx.get("timestamp")
-                })
+        for i, amount, z_score, severity in zip(
+            outliers.tolist(), outlier_amounts.tolist(), z_scores.tolist(), severities.tolist()
+        ):
+            tx = transactions[i]
+            anomalies.append(_describe({
+                "type": "amount_anomaly",
+                "type_ja": "金額異常",
+                "type_en": "Amount Anomaly",
+                "severity": _Z_SCORE_SEVERITY[severity],
+                "transaction_hash": tx.get("hash"),
+                "amount": amount,
+                "z_score": z_score,
+                "mean": mean,
+                "stdev": stdev,
+                "timestamp": tx.get("timestamp")
+            }, language, z_score=z_score))
         
         return anomalies
     
     def _detect_frequency_anomalies(
         self,
-        transactions: List[Dict[str, Any]],
-        address: str
+        days: np.ndarray,
+        address: str,
+        language: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Detect anomalous transaction frequencies
         取引頻度の異常検知
+        
+        Args:
+            days: Transaction times as days since the epoch
+            address: Target address for analysis
         """
-        # Group transactions by day
-        daily_counts = defaultdict(int)
+        if days.size < 7:  # Cannot span a week of data
+            return []
         
-        for tx in transactions:
-            timestamp = tx.get("timestamp")
-            if isinstance(timestamp, str):
-                timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            
-            date_key = timestamp.date()
-            daily_counts[date_key] += 1
+        # Group transactions by day (one bin per day since the first one)
+        first_day = int(days.min())
+        daily_counts = np.bincount(days - first_day)
+        active_days = np.flatnonzero(daily_counts)
         
-        if len(daily_counts) < 7:  # Need at least a week of data
+        if active_days.size < 7:  # Need at least a week of data
             return []
         
-        counts = list(daily_counts.values())
-        mean = statistics.mean(counts)
-        stdev = statistics.pstdev(counts)
+        counts = daily_counts[active_days].astype(np.float64)
+        mean, stdev, outliers = _zscore_outliers(counts, self.z_score_threshold, False)
+        mean = float(mean)
+        stdev = float(stdev)
         
-        if stdev == 0:
-            return []
+        outlier_counts = counts[outliers]
+        z_scores = (outlier_counts - mean) / stdev
+        severities = (z_scores > _HIGH_Z_SCORE).view(np.uint8)
         
         anomalies = []
-        for date, count in daily_counts.items():
-            z_score = (count - mean) / stdev
-            
-            if z_score > self.z_score_threshold:
-                anomalies.append({
-                    "type": "frequency_anomaly",
-                    "type_ja": "頻度異常",
-                    "type_en": "Frequency Anomaly",
-                    "severity": "high" if z_score > 4.0 else "medium",
-                    "description_ja": f"異常に高い取引頻度（Z-score: {z_score:.2f}）",
-                    "description_en": f"Abnormally high transaction frequency (Z-score: {z_score:.2f})",
-                    "date": date.isoformat(),
-                    "transaction_count": count,
-                    "z_score": z_score,
-                    "mean": mean,
-                    "stdev": stdev
-                })
+        for day_index, count, z_score, severity in zip(
+            active_days[outliers].tolist(), outlier_counts.tolist(),
+            z_scores.tolist(), severities.tolist()
+        ):
+            day = first_day + day_index
+            count = int(count)
+            anomalies.append(_describe({
+                "type": "frequency_anomaly",
+                "type_ja": "頻度異常",
+                "type_en": "Frequency Anomaly",
+                "severity": _Z_SCORE_SEVERITY[severity],
+                "date": date.fromordinal(_EPOCH_ORDINAL + day).isoformat(),
+                "transaction_count": count,
+                "z_score": z_score,
+                "mean": mean,
+                "stdev": stdev
+            }, language, z_score=z_score))
         
         return anomalies
     
     def _detect_time_anomalies(
         self,
-        transactions: List[Dict[str, Any]],
-        address: str
+        hours: np.ndarray,
+        address: str,
+        language: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Detect anomalous time patterns (e.g., unusual hours)
         時間パターンの異常検知（例：異常な時間帯）
+        
+        Args:
+            hours: Hour of day (0-23) of each transaction
+            address: Target address for analysis
         """
-        # Group transactions by hour of day
-        hourly_counts = defaultdict(int)
+        if hours.size < 6:  # Cannot cover enough distinct hours
+            return []
         
-        for tx in transactions:
-            timestamp = tx.get("timestamp")
-            if isinstance(timestamp, str):
-                timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            
-            hour = timestamp.hour
-            hourly_counts[hour] += 1
+        # Group transactions by hour of day; the 24 bins are handled as a
+        # dense list, which is cheaper than NumPy reductions at this size
+        hourly_counts = np.bincount(hours, minlength=24).tolist()
+        active_hours = [count for count in hourly_counts if count]
         
-        if len(hourly_counts) < 6:  # Need sufficient diversity
+        if len(active_hours) < 6:  # Need sufficient diversity
             return []
         
-        counts = list(hourly_counts.values())
-        mean = statistics.mean(counts)
-        stdev = statistics.pstdev(counts)
+        mean, stdev = _mean_std(active_hours)
         
         if stdev == 0:
             return []
@@ -191,100 +462,96 @@ class AnomalyDetector:
         anomalies = []
         
         # Check for unusual activity in off-peak hours (1-5 AM)
-        off_peak_hours = [1, 2, 3, 4, 5]
-        off_peak_total = sum(hourly_counts.get(h, 0) for h in off_peak_hours)
-        total_transactions = sum(hourly_counts.values())
+        off_peak_total = sum(hourly_counts[_OFF_PEAK_HOURS])
+        total_transactions = sum(active_hours)
         
         if total_transactions > 0:
             off_peak_ratio = off_peak_total / total_transactions
             
             if off_peak_ratio > 0.4:  # More than 40% during off-peak
-                anomalies.append({
+                anomalies.append(_describe({
                     "type": "time_pattern_anomaly",
                     "type_ja": "時間パターン異常",
                     "type_en": "Time Pattern Anomaly",
                     "severity": "medium",
-                    "description_ja": f"深夜時間帯（1-5時）に異常に多い取引（{off_peak_ratio*100:.1f}%）",
-                    "description_en": f"Abnormally high activity during off-peak hours 1-5 AM ({off_peak_ratio*100:.1f}%)",
                     "off_peak_ratio": off_peak_ratio,
                     "off_peak_count": off_peak_total,
                     "total_count": total_transactions
-                })
+                }, language, percent=off_peak_ratio * 100))
         
         return anomalies
     
     def _detect_counterparty_anomalies(
         self,
-        transactions: List[Dict[str, Any]],
-        address: str
+        counterparty_addresses: np.ndarray,
+        amounts: np.ndarray,
+        address: str,
+        language: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Detect anomalous counterparty patterns
         取引相手の異常パターン検知
+        
+        Args:
+            counterparty_addresses: Lowercased counterparty of each transaction
+            amounts: Amount of each transaction
+            address: Target address for analysis
         """
-        # Count interactions per counterparty
-        counterparty_counts = defaultdict(int)
-        counterparty_amounts = defaultdict(float)
-        
-        for tx in transactions:
-            from_addr = tx.get("from", "").lower()
-            to_addr = tx.get("to", "").lower()
-            amount = tx.get("value", 0)
-            
-            counterparty = to_addr if from_addr == address.lower() else from_addr
-            counterparty_counts[counterparty] += 1
-            counterparty_amounts[counterparty] += amount
+        if counterparty_addresses.size < 5:  # Cannot have enough counterparties
+            return []
         
-        if len(counterparty_counts) < 5:  # Need sufficient counterparties
+        # Group by counterparty: count and total amount per unique address
+        counterparties, inverse = np.unique(counterparty_addresses, return_inverse=True)
+        
+        if counterparties.size < 5:  # Need sufficient counterparties
             return []
         
-        counts = list(counterparty_counts.values())
-        amounts = list(counterparty_amounts.values())
+        counterparty_counts = np.bincount(inverse)
+        counterparty_amounts = np.bincount(inverse, weights=amounts)
+        
+        avg_amount = float(counterparty_amounts.mean())
+        large_amount = avg_amount * 2
         
-        mean_count = statistics.mean(counts)
-        stdev_count = statistics.pstdev(counts)
+        mean_count, stdev_count, outliers = _zscore_outliers(
+            counterparty_counts.astype(np.float64), self.z_score_threshold, False
+        )
+        mean_count = float(mean_count)
+        stdev_count = float(stdev_count)
         
         anomalies = []
         
         # Detect highly concentrated trading relationships
-        if stdev_count > 0:
-            for counterparty, count in counterparty_counts.items():
-                z_score = (count - mean_count) / stdev_count
-                
-                if z_score > self.z_score_threshold:
-                    total_amount = counterparty_amounts[counterparty]
-                    
-                    anomalies.append({
-                        "type": "counterparty_concentration",
-                        "type_ja": "取引相手集中",
-                        "type_en": "Counterparty Concentration",
-                        "severity": "medium",
-                        "description_ja": f"特定アドレスとの異常に多い取引（Z-score: {z_score:.2f}）",
-                        "description_en": f"Abnormally high concentration with specific address (Z-score: {z_score:.2f})",
-                        "counterparty": counterparty,
-                        "transaction_count": count,
-                        "total_amount": total_amount,
-                        "z_score": z_score,
-                        "mean": mean_count,
-                        "stdev": stdev_count
-                    })
+        for i in outliers.tolist():
+            count = int(counterparty_counts[i])
+            z_score = (count - mean_count) / stdev_count
+            
+            anomalies.append(_describe({
+                "type": "counterparty_concentration",
+                "type_ja": "取引相手集中",
+                "type_en": "Counterparty Concentration",
+                "severity": "medium",
+                "counterparty": counterparties[i],
+                "transaction_count": count,
+                "total_amount": float(counterparty_amounts[i]),
+                "z_score": z_score,
+                "mean": mean_count,
+                "stdev": stdev_count
+            }, language, z_score=z_score))
         
         # Detect one-time large transactions (potential rug pull indicator)
-        for counterparty, count in counterparty_counts.items():
-            if count == 1:  # Only one transaction
-                amount = counterparty_amounts[counterparty]
-                if amount > statistics.mean(amounts) * 2:  # Significantly larger than average
-                    anomalies.append({
-                        "type": "one_time_large_transaction",
-                        "type_ja": "一回限りの大口取引",
-                        "type_en": "One-time Large Transaction",
-                        "severity": "high",
-                        "description_ja": "新規アドレスとの一回限りの大口取引",
-                        "description_en": "One-time large transaction with new address",
-                        "counterparty": counterparty,
-                        "amount": amount,
-                        "average_amount": statistics.mean(amounts)
-                    })
+        one_time_large = np.flatnonzero(
+            (counterparty_counts == 1) & (counterparty_amounts > large_amount)
+        )
+        for i in one_time_large.tolist():
+            anomalies.append(_describe({
+                "type": "one_time_large_transaction",
+                "type_ja": "一回限りの大口取引",
+                "type_en": "One-time Large Transaction",
+                "severity": "high",
+                "counterparty": counterparties[i],
+                "amount": float(counterparty_amounts[i]),
+                "average_amount": avg_amount
+            }, language))
         
         return anomalies
     
@@ -304,17 +571,10 @@ class AnomalyDetector:
         if not anomalies:
             return 0.0
         
-        severity_weights = {
-            "critical": 1.0,
-            "high": 0.75,
-            "medium": 0.5,
-            "low": 0.25
-        }
-        
-        total_weight = 0.0
-        for anomaly in anomalies:
-            severity = anomaly.get("severity", "medium")
-            total_weight += severity_weights.get(severity, 0.5)
+        total_weight = sum(
+            _SEVERITY_WEIGHTS.get(anomaly.get("severity", "medium"), _DEFAULT_SEVERITY_WEIGHT)
+            for anomaly in anomalies
+        )
         
         # Normalize to 0-100 scale
         # More anomalies and higher severity = higher score
@@ -335,15 +595,9 @@ class AnomalyDetector:
         Returns:
             Summary dictionary with counts and severity breakdown
         """
-        type_counts = defaultdict(int)
-        severity_counts = defaultdict(int)
-        
-        for anomaly in anomalies:
-            anomaly_type = anomaly.get("type", "unknown")
-            severity = anomaly.get("severity", "medium")
-            
-            type_counts[anomaly_type] += 1
-            severity_counts[severity] += 1
+        # Counter consumes the generators in C (collections._count_elements)
+        type_counts = Counter(anomaly.get("type", "unknown") for anomaly in anomalies)
+        severity_counts = Counter(anomaly.get("severity", "medium") for anomaly in anomalies)
         
         return {
             "total_anomalies": len(anomalies),
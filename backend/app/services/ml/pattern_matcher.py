@@ -4,14 +4,318 @@ Pattern Matcher for detecting money laundering patterns
 """
 import json
 import logging
+import threading
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from types import MappingProxyType
+from typing import Callable, List, Dict, Any, Mapping, Optional, Tuple
 from datetime import datetime, timedelta
-from collections import defaultdict, Counter
-import statistics
+from collections import OrderedDict, defaultdict, deque, Counter
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+import xxhash
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; run the sweep in plain Python
+    njit = None
 
 logger = logging.getLogger(__name__)
 
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+# Missing timestamps are stored as NumPy's NaT sentinel
+_NAT = np.iinfo(np.int64).min
+_NS_PER_SECOND = 1_000_000_000
+_NS_PER_HOUR = 3600 * _NS_PER_SECOND
+
+# Funds forwarded within this window after receipt count as rapid movement
+_RAPID_MOVEMENT_WINDOW_NS = 300 * _NS_PER_SECOND
+
+# Detector method for each pattern id in patterns.json
+_DETECTORS = {
+    "smurfing": "_detect_smurfing",
+    "layering": "_detect_layering",
+    "mixing": "_detect_mixing",
+    "structuring": "_detect_structuring",
+    "circular_trading": "_detect_circular_trading",
+    "rapid_movement": "_detect_rapid_movement",
+    "dusting": "_detect_dusting",
+    "peel_chain": "_detect_peel_chain",
+}
+
+
+def _wall_clock_ns(timestamp: Any) -> int:
+    """
+    Convert a transaction timestamp to nanoseconds since the epoch
+    
+    The timestamp's own wall-clock time is used (any UTC offset is dropped),
+    so hour buckets match timestamp.replace(minute=0, ...).
+    
+    Args:
+        timestamp: ISO 8601 string, datetime or None
+    
+    Returns:
+        Nanoseconds since 1970-01-01T00:00:00, or NaT if missing
+    """
+    if not timestamp:
+        return _NAT
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    return (timestamp.replace(tzinfo=None) - _EPOCH) // _ONE_MICROSECOND * 1000
+
+
+def _normalize(transactions: List[Dict[str, Any]], address: str) -> Dict[str, Any]:
+    """
+    Build a column-wise (struct-of-arrays) view of the transactions
+    取引リストを列指向の配列に変換
+    
+    Addresses are lowercased and timestamps parsed once here, so the
+    detectors only work with NumPy masks over these columns.
+    
+    Args:
+        transactions: List of transaction dictionaries
+        address: Target address (lowercase)
+    
+    Returns:
+        Dict of equal-length arrays: "from", "to" and "hash" (object),
+        "value" (float64) and "ts" (int64 nanoseconds, NaT if missing);
+        "from_idx"/"to_idx", the rows sent/received by the address; and
+        "outgoing", a map of sender address to its row indices
+    """
+    n = len(transactions)
+    from_addrs = [(tx.get("from") or "").lower() for tx in transactions]
+    
+    outgoing = defaultdict(list)
+    for row, from_addr in enumerate(from_addrs):
+        outgoing[from_addr].append(row)
+    
+    from_arr = np.array(from_addrs, dtype=object)
+    to_arr = np.array([(tx.get("to") or "").lower() for tx in transactions], dtype=object)
+    
+    return {
+        "from": from_arr,
+        "to": to_arr,
+        "hash": np.array([tx.get("hash") for tx in transactions], dtype=object),
+        "value": np.fromiter(
+            (tx.get("value", 0) for tx in transactions), dtype=np.float64, count=n
+        ),
+        "ts": np.fromiter(
+            (_wall_clock_ns(tx.get("timestamp")) for tx in transactions), dtype=np.int64, count=n
+        ),
+        "from_idx": np.flatnonzero(from_arr == address),
+        "to_idx": np.flatnonzero(to_arr == address),
+        "outgoing": dict(outgoing),
+    }
+
+
+@lru_cache(maxsize=None)
+def _load_patterns(
+    patterns_file: str
+) -> Tuple[Mapping[str, Any], Mapping[str, Mapping[str, Any]], Mapping[str, np.ndarray]]:
+    """
+    Load a patterns.json file and precompute what the detectors need
+    パターン定義の読み込み（ファイルごとに一度だけ）
+    
+    Everything returned is read-only, since it is shared by every
+    PatternMatcher created for the same file.
+    
+    Args:
+        patterns_file: Resolved path to patterns.json
+    
+    Returns:
+        (config with "patterns" as a tuple, result template per pattern id,
+        lowercased known mixer addresses per pattern id)
+    """
+    with open(patterns_file, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    
+    patterns = tuple(MappingProxyType(pattern) for pattern in config["patterns"])
+    config["patterns"] = patterns
+    
+    # Pattern fields shared by every result of that pattern
+    templates = {
+        pattern["id"]: MappingProxyType({
+            "pattern_id": pattern["id"],
+            "pattern_name": pattern["name"],
+            "pattern_name_ja": pattern["name_ja"],
+            "pattern_name_en": pattern["name_en"],
+            "description_ja": pattern["description_ja"],
+            "description_en": pattern["description_en"],
+            "risk_level": pattern["risk_level"],
+        })
+        for pattern in patterns
+    }
+    
+    # Lowercased mixer addresses per pattern, matched with np.isin
+    known_mixers = {}
+    for pattern in patterns:
+        mixers = np.array(
+            sorted({mixer.lower() for mixer in pattern.get("known_mixers", [])}), dtype=object
+        )
+        mixers.flags.writeable = False
+        known_mixers[pattern["id"]] = mixers
+    
+    return MappingProxyType(config), MappingProxyType(templates), MappingProxyType(known_mixers)
+
+
+def _is_layering_chain(columns: Dict[str, Any], address: str, chain: List[int]) -> bool:
+    """Whether a chain counts as layering (5+ hops within 24 hours)"""
+    if len(chain) < 5:  # Need at least 5 hops
+        return False
+    
+    # Check if chain completed within 24 hours
+    timestamps = columns["ts"]
+    if (timestamps[chain[-1]] - timestamps[chain[0]]) / _NS_PER_SECOND > 86400:
+        return False
+    
+    # Chains are simple paths, so the only possible address reuse
+    # is a return to the start (that is circular trading)
+    return columns["to"][chain[-1]] != address
+
+
+def _is_cycle_chain(columns: Dict[str, Any], address: str, chain: List[int]) -> bool:
+    """Whether a chain returns funds to the address within 48 hours"""
+    if len(chain) < 3:
+        return False
+    
+    # Check if last transaction returns to original address
+    if columns["to"][chain[-1]] != address:
+        return False
+    
+    # Check timeframe (48 hours)
+    timestamps = columns["ts"]
+    return (timestamps[chain[-1]] - timestamps[chain[0]]) / _NS_PER_SECOND <= 172800
+
+
+# Chain predicate for each pattern detected from transaction chains
+_CHAIN_PREDICATES = {
+    "layering": _is_layering_chain,
+    "circular_trading": _is_cycle_chain,
+}
+
+# Chain patterns whose chains must return to the start address, so their
+# walk can skip transactions from which the start is no longer reachable
+_CLOSED_CHAIN_PATTERNS = frozenset({"circular_trading"})
+
+
+def _fingerprint(transactions: List[Dict[str, Any]]) -> Optional[bytes]:
+    """
+    128-bit digest of the fields the detectors read, in list order
+    
+    Order is part of the digest because detectors report the first match
+    in transaction order. The hash alone is not enough: rows can share a
+    hash (e.g. token transfers of one transaction).
+    
+    Returns:
+        Digest, or None if any transaction has no hash
+    """
+    fields = []
+    for tx in transactions:
+        tx_hash = tx.get("hash")
+        if not tx_hash:
+            return None
+        fields.append(
+            f"{tx_hash}\x1f{tx.get('from')}\x1f{tx.get('to')}\x1f"
+            f"{tx.get('value', 0)}\x1f{tx.get('timestamp')}"
+        )
+    return xxhash.xxh3_128_digest("\x1e".join(fields).encode())
+
+
+def _rapid_movement_kernel(
+    in_ts: np.ndarray,
+    in_values: np.ndarray,
+    out_ts: np.ndarray,
+    out_values: np.ndarray,
+    window_ns: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pair incoming with outgoing transfers that forward the funds quickly
+    
+    Both sides must be sorted by timestamp. An outgoing transfer matches
+    when it follows within (0, window_ns] and moves at least 95% of the
+    incoming amount. Written as an explicit two-pointer sweep so numba
+    can compile it; the first pass only counts matches so the output can
+    be allocated exactly.
+    
+    Returns:
+        (positions into the incoming arrays, positions into the outgoing arrays)
+    """
+    n_in = in_ts.shape[0]
+    n_out = out_ts.shape[0]
+    
+    count = 0
+    lo = 0
+    for i in range(n_in):
+        while lo < n_out and out_ts[lo] <= in_ts[i]:
+            lo += 1
+        limit = in_ts[i] + window_ns
+        threshold = 0.95 * in_values[i]
+        j = lo
+        while j < n_out and out_ts[j] <= limit:
+            if out_values[j] >= threshold:
+                count += 1
+            j += 1
+    
+    in_pos = np.empty(count, np.int64)
+    out_pos = np.empty(count, np.int64)
+    k = 0
+    lo = 0
+    for i in range(n_in):
+        while lo < n_out and out_ts[lo] <= in_ts[i]:
+            lo += 1
+        limit = in_ts[i] + window_ns
+        threshold = 0.95 * in_values[i]
+        j = lo
+        while j < n_out and out_ts[j] <= limit:
+            if out_values[j] >= threshold:
+                in_pos[k] = i
+                out_pos[k] = j
+                k += 1
+            j += 1
+    
+    return in_pos, out_pos
+
+
+def _rapid_movement_pairs_python(
+    in_ts: np.ndarray,
+    in_values: np.ndarray,
+    out_ts: np.ndarray,
+    out_values: np.ndarray,
+    window_ns: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pure-Python equivalent of _rapid_movement_kernel
+    
+    Works on plain lists and locates each window with bisect, which is far
+    cheaper in the interpreter than indexing NumPy arrays per element.
+    """
+    out_ts = out_ts.tolist()
+    out_values = out_values.tolist()
+    in_pos = []
+    out_pos = []
+    
+    for i, (ts, value) in enumerate(zip(in_ts.tolist(), in_values.tolist())):
+        lo = bisect_right(out_ts, ts)
+        hi = bisect_right(out_ts, ts + window_ns, lo)
+        threshold = 0.95 * value
+        for j in range(lo, hi):
+            if out_values[j] >= threshold:
+                in_pos.append(i)
+                out_pos.append(j)
+    
+    return np.array(in_pos, dtype=np.int64), np.array(out_pos, dtype=np.int64)
+
+
+# Compiled once per process (and cached on disk across processes)
+if njit is not None:
+    _rapid_movement_pairs = njit(cache=True, nogil=True)(_rapid_movement_kernel)
+else:
+    _rapid_movement_pairs = _rapid_movement_pairs_python
+
 
 class PatternMatcher:
     """
@@ -19,6 +323,21 @@ class PatternMatcher:
     ルールベースのパターンマッチャー：疑わしい取引パターンを検出
     """
     
+    # Results are cached per (patterns file, address, transaction fingerprint)
+    # and shared by all instances, since API handlers create one per request
+    RESULT_CACHE_SIZE = 1024
+    _result_cache: "OrderedDict[Tuple[str, str, bytes], Tuple[Dict[str, Any], ...]]" = OrderedDict()
+    _result_cache_lock = threading.Lock()
+    
+    # Inputs at least this large run the detectors on a shared thread pool
+    PARALLEL_MIN_TRANSACTIONS = 50_000
+    
+    # Chains queued by an unpruned chain walk before it gives up; simple
+    # paths grow exponentially on densely connected inputs
+    MAX_CHAIN_EXPANSIONS = 200_000
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+    
     def __init__(self, patterns_file: Optional[str] = None):
         """
         Initialize pattern matcher
@@ -29,15 +348,40 @@ class PatternMatcher:
         if patterns_file is None:
             patterns_file = Path(__file__).parent / "patterns.json"
         
-        with open(patterns_file, 'r', encoding='utf-8') as f:
-            self.patterns_config = json.load(f)
+        # Parsed once per process; instances share the read-only result
+        self._patterns_file = str(Path(patterns_file).resolve())
+        self.patterns_config, self._templates, self._known_mixers = _load_patterns(
+            self._patterns_file
+        )
         
         self.patterns = self.patterns_config["patterns"]
         self.risk_weights = self.patterns_config["risk_weights"]
         self.confidence_thresholds = self.patterns_config["confidence_thresholds"]
         
+        # Detector bound to each known pattern, so detection skips the lookup
+        self._dispatch = {
+            pattern_id: getattr(self, method) for pattern_id, method in _DETECTORS.items()
+        }
+        self._detectors = [
+            (pattern, self._dispatch[pattern["id"]])
+            for pattern in self.patterns
+            if pattern["id"] in self._dispatch
+        ]
+        self._chain_patterns = [
+            pattern["id"] for pattern, _ in self._detectors
+            if pattern["id"] in _CHAIN_PREDICATES
+        ]
+        
         logger.info(f"Loaded {len(self.patterns)} patterns from {patterns_file}")
     
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        """Get the thread pool shared by all instances (created on first use)"""
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="patterns")
+            return cls._executor
+    
     def detect_patterns(
         self,
         transactions: List[Dict[str, Any]],
@@ -53,12 +397,47 @@ class PatternMatcher:
         Returns:
             List of detected patterns with confidence scores
         """
-        detected = []
-        
-        for pattern in self.patterns:
-            result = self._match_pattern(pattern, transactions, address)
-            if result:
-                detected.append(result)
+        target = address.lower()
+        
+        # Reuse the result when the same transactions were analysed recently
+        fingerprint = _fingerprint(transactions)
+        cache_key = None
+        if fingerprint is not None:
+            cache_key = (self._patterns_file, target, fingerprint)
+            with self._result_cache_lock:
+                cached = self._result_cache.get(cache_key)
+                if cached is not None:
+                    self._result_cache.move_to_end(cache_key)
+            if cached is not None:
+                logger.debug(f"Pattern cache hit for address {address}")
+                return list(cached)
+        
+        # Parse and lowercase once, shared by every detector
+        columns = _normalize(transactions, target)
+        if self._chain_patterns:
+            columns["chains"] = self._find_chains(columns, target, self._chain_patterns)
+        
+        if len(transactions) >= self.PARALLEL_MIN_TRANSACTIONS:
+            # Detectors only read the columns, and NumPy (and the nogil numba
+            # kernel) release the GIL; results keep the pattern order
+            executor = self._get_executor()
+            futures = [
+                executor.submit(detector, pattern, columns, target)
+                for pattern, detector in self._detectors
+            ]
+            results = [future.result() for future in futures]
+        else:
+            # Thread hand-off costs more than it saves on small inputs
+            results = [detector(pattern, columns, target) for pattern, detector in self._detectors]
+        
+        detected = [result for result in results if result]
+        
+        if cache_key is not None:
+            with self._result_cache_lock:
+                self._result_cache[cache_key] = tuple(detected)
+                self._result_cache.move_to_end(cache_key)
+                if len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
         
         logger.info(f"Detected {len(detected)} patterns for address {address}")
         return detected
@@ -66,7 +445,7 @@ class PatternMatcher:
     def _match_pattern(
         self,
         pattern: Dict[str, Any],
-        transactions: List[Dict[str, Any]],
+        columns: Dict[str, Any],
         address: str
     ) -> Optional[Dict[str, Any]]:
         """
@@ -74,218 +453,160 @@ class PatternMatcher:
         
         Args:
             pattern: Pattern definition
-            transactions: List of transactions
-            address: Target address
+            columns: Column-wise transactions from _normalize
+            address: Target address (lowercase)
         
         Returns:
             Pattern match result or None if no match
         """
-        pattern_id = pattern["id"]
-        
-        # Dispatch to specific pattern detector
-        if pattern_id == "smurfing":
-            return self._detect_smurfing(pattern, transactions, address)
-        elif pattern_id == "layering":
-            return self._detect_layering(pattern, transactions, address)
-        elif pattern_id == "mixing":
-            return self._detect_mixing(pattern, transactions, address)
-        elif pattern_id == "structuring":
-            return self._detect_structuring(pattern, transactions, address)
-        elif pattern_id == "circular_trading":
-            return self._detect_circular_trading(pattern, transactions, address)
-        elif pattern_id == "rapid_movement":
-            return self._detect_rapid_movement(pattern, transactions, address)
-        elif pattern_id == "dusting":
-            return self._detect_dusting(pattern, transactions, address)
-        elif pattern_id == "peel_chain":
-            return self._detect_peel_chain(pattern, transactions, address)
-        
-        return None
+        detector = self._dispatch.get(pattern["id"])
+        if detector is None:
+            return None
+        if pattern["id"] in _CHAIN_PREDICATES and "chains" not in columns:
+            columns["chains"] = self._find_chains(columns, address, list(_CHAIN_PREDICATES))
+        return detector(pattern, columns, address)
     
     def _detect_smurfing(
         self,
         pattern: Dict[str, Any],
-        transactions: List[Dict[str, Any]],
+        columns: Dict[str, Any],
         address: str
     ) -> Optional[Dict[str, Any]]:
         """
         Detect smurfing pattern: many small transactions in short period
         スマーフィング検出：短期間に多数の小額取引
         """
-        # Group transactions by 1-hour windows
-        time_windows = defaultdict(list)
+        # Bucket outgoing transactions by 1-hour windows
+        outgoing = columns["from_idx"]
+        outgoing = outgoing[columns["ts"][outgoing] != _NAT]
+        if outgoing.size < 10:  # Need at least 10 transactions
+            return None
         
-        for tx in transactions:
-            if tx.get("from", "").lower() != address.lower():
-                continue
-            
-            timestamp = tx.get("timestamp")
-            if not timestamp:
-                continue
-            
-            if isinstance(timestamp, str):
-                timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            
-            # Group by hour
-            hour_key = timestamp.replace(minute=0, second=0, microsecond=0)
-            time_windows[hour_key].append(tx)
-        
-        # Check each window for smurfing pattern
-        for hour, txs in time_windows.items():
-            if len(txs) < 10:  # Need at least 10 transactions
-                continue
-            
-            # Check amounts are small
-            amounts = [tx.get("value", 0) for tx in txs]
-            if not all(amt < 1.0 for amt in amounts):
-                continue
-            
-            # Check variance is low (similar amounts)
-            if len(amounts) > 1:
-                variance = statistics.pvariance(amounts)
-                mean = statistics.mean(amounts)
-                if mean > 0:
-                    cv = (variance ** 0.5) / mean
-                    if cv >= 0.3:
-                        continue
-            
-            # Pattern detected
-            confidence = min(len(txs) / 20, 1.0)  # More transactions = higher confidence
-            
-            return {
-                "pattern_id": pattern["id"],
-                "pattern_name": pattern["name"],
-                "pattern_name_ja": pattern["name_ja"],
-                "pattern_name_en": pattern["name_en"],
-                "description_ja": pattern["description_ja"],
-                "description_en": pattern["description_en"],
-                "risk_level": pattern["risk_level"],
-                "confidence": confidence,
-                "addresses_count": len(set(tx.get("to", "") for tx in txs)),
-                "total_amount": sum(amounts),
-                "transaction_count": len(txs),
-                "timeframe": "1 hour",
-                "timestamp": hour.isoformat(),
-                "evidence": {
-                    "transaction_hashes": [tx.get("hash") for tx in txs[:10]],  # First 10
-                    "average_amount": statistics.mean(amounts),
-                    "amount_variance": variance if len(amounts) > 1 else 0
-                }
-            }
+        hours, first_rows, bucket, counts = np.unique(
+            columns["ts"][outgoing] // _NS_PER_HOUR,
+            return_index=True, return_inverse=True, return_counts=True
+        )
         
-        return None
+        # Cheap checks first: enough transactions, all amounts small
+        values = columns["value"][outgoing]
+        large = np.bincount(bucket, weights=values >= 1.0, minlength=hours.size)
+        candidates = (counts >= 10) & (large == 0)
+        if not candidates.any():
+            return None
+        
+        # Per-bucket mean and variance only for the remaining windows
+        keep = candidates[bucket]
+        kept_bucket = bucket[keep]
+        kept_values = values[keep]
+        mean = np.bincount(kept_bucket, weights=kept_values, minlength=hours.size) / counts
+        variance = np.bincount(
+            kept_bucket, weights=kept_values * kept_values, minlength=hours.size
+        ) / counts - mean * mean
+        
+        # Similar amounts (cv < 0.3)
+        matches = np.flatnonzero(
+            candidates & ((mean <= 0) | (np.sqrt(np.maximum(variance, 0)) < 0.3 * mean))
+        )
+        if not matches.size:
+            return None
+        
+        # Report the window that appears first in the transaction list
+        match = matches[np.argmin(first_rows[matches])]
+        rows = outgoing[bucket == match]
+        amounts = columns["value"][rows]
+        
+        # Pattern detected
+        confidence = min(rows.size / 20, 1.0)  # More transactions = higher confidence
+        
+        return {
+            **self._templates[pattern["id"]],
+            "confidence": confidence,
+            "addresses_count": np.unique(columns["to"][rows]).size,
+            "total_amount": float(amounts.sum()),
+            "transaction_count": int(rows.size),
+            "timeframe": "1 hour",
+            "timestamp": (_EPOCH + timedelta(hours=int(hours[match]))).isoformat(),
+            "evidence": {
+                "transaction_hashes": columns["hash"][rows[:10]].tolist(),  # First 10
+                "average_amount": float(amounts.mean()),
+                "amount_variance": float(amounts.var())
+            }
+        }
     
     def _detect_layering(
         self,
         pattern: Dict[str, Any],
-        transactions: List[Dict[str, Any]],
+        columns: Dict[str, Any],
         address: str
     ) -> Optional[Dict[str, Any]]:
         """
         Detect layering pattern: funds through multiple intermediaries
         レイヤリング検出：複数の中間アドレスを経由する資金移動
         """
-        # Build transaction chains
-        chains = self._build_transaction_chains(transactions, address, max_hops=10)
+        # First layering chain from the walk shared with circular trading
+        chain = columns["chains"].get(pattern["id"])
+        if chain is None:
+            return None
         
-        for chain in chains:
-            if len(chain) < 5:  # Need at least 5 hops
-                continue
-            
-            # Check if chain completed within 24 hours
-            first_time = chain[0].get("timestamp")
-            last_time = chain[-1].get("timestamp")
-            
-            if isinstance(first_time, str):
-                first_time = datetime.fromisoformat(first_time.replace('Z', '+00:00'))
-            if isinstance(last_time, str):
-                last_time = datetime.fromisoformat(last_time.replace('Z', '+00:00'))
-            
-            time_diff = (last_time - first_time).total_seconds()
-            if time_diff > 86400:  # More than 24 hours
-                continue
-            
-            # Check for address reuse (should be minimal)
-            addresses = [tx.get("from") for tx in chain] + [tx.get("to") for tx in chain]
-            if len(addresses) != len(set(addresses)):  # Duplicate addresses
-                continue
-            
-            # Pattern detected
-            confidence = min(len(chain) / 10, 1.0)
-            
-            return {
-                "pattern_id": pattern["id"],
-                "pattern_name": pattern["name"],
-                "pattern_name_ja": pattern["name_ja"],
-                "pattern_name_en": pattern["name_en"],
-                "description_ja": pattern["description_ja"],
-                "description_en": pattern["description_en"],
-                "risk_level": pattern["risk_level"],
-                "confidence": confidence,
-                "addresses_count": len(set(addresses)),
-                "total_amount": sum(tx.get("value", 0) for tx in chain),
-                "hop_count": len(chain),
-                "timeframe_seconds": int(time_diff),
-                "evidence": {
-                    "transaction_hashes": [tx.get("hash") for tx in chain],
-                    "chain_addresses": addresses[:10]  # First 10 addresses
-                }
-            }
+        timestamps = columns["ts"]
+        time_diff = (timestamps[chain[-1]] - timestamps[chain[0]]) / _NS_PER_SECOND
+        addresses = [address] + columns["to"][chain].tolist()
+        
+        # Pattern detected
+        confidence = min(len(chain) / 10, 1.0)
         
-        return None
+        return {
+            **self._templates[pattern["id"]],
+            "confidence": confidence,
+            "addresses_count": len(addresses),
+            "total_amount": float(columns["value"][chain].sum()),
+            "hop_count": len(chain),
+            "timeframe_seconds": int(time_diff),
+            "evidence": {
+                "transaction_hashes": columns["hash"][chain].tolist(),
+                "chain_addresses": addresses[:10]  # First 10 addresses
+            }
+        }
     
     def _detect_mixing(
         self,
         pattern: Dict[str, Any],
-        transactions: List[Dict[str, Any]],
+        columns: Dict[str, Any],
         address: str
     ) -> Optional[Dict[str, Any]]:
         """
         Detect mixing pattern: interaction with known mixers
         ミキシング検出：既知のミキサーとの取引
         """
-        known_mixers = set(mixer.lower() for mixer in pattern.get("known_mixers", []))
+        known_mixers = self._known_mixers[pattern["id"]]
         
-        mixer_txs = []
-        for tx in transactions:
-            from_addr = tx.get("from", "").lower()
-            to_addr = tx.get("to", "").lower()
-            
-            if from_addr in known_mixers or to_addr in known_mixers:
-                mixer_txs.append(tx)
+        to_mixer = np.isin(columns["to"], known_mixers)
+        mixer_rows = np.flatnonzero(to_mixer | np.isin(columns["from"], known_mixers))
         
-        if not mixer_txs:
+        if not mixer_rows.size:
             return None
         
         # Pattern detected - this is critical risk
-        total_amount = sum(tx.get("value", 0) for tx in mixer_txs)
+        to_addrs = columns["to"][mixer_rows]
         
         return {
-            "pattern_id": pattern["id"],
-            "pattern_name": pattern["name"],
-            "pattern_name_ja": pattern["name_ja"],
-            "pattern_name_en": pattern["name_en"],
-            "description_ja": pattern["description_ja"],
-            "description_en": pattern["description_en"],
-            "risk_level": pattern["risk_level"],
+            **self._templates[pattern["id"]],
             "confidence": 1.0,  # Mixer detection is definitive
-            "addresses_count": len(set(tx.get("to") for tx in mixer_txs)),
-            "total_amount": total_amount,
-            "transaction_count": len(mixer_txs),
+            "addresses_count": np.unique(to_addrs).size,
+            "total_amount": float(columns["value"][mixer_rows].sum()),
+            "transaction_count": int(mixer_rows.size),
             "evidence": {
-                "transaction_hashes": [tx.get("hash") for tx in mixer_txs],
-                "mixer_addresses": list(set(
-                    tx.get("to") if tx.get("to", "").lower() in known_mixers
-                    else tx.get("from")
-                    for tx in mixer_txs
-                ))
+                "transaction_hashes": columns["hash"][mixer_rows].tolist(),
+                "mixer_addresses": np.unique(
+                    np.where(to_mixer[mixer_rows], to_addrs, columns["from"][mixer_rows])
+                ).tolist()
             }
         }
     
     def _detect_structuring(
         self,
         pattern: Dict[str, Any],
-        transactions: List[Dict[str, Any]],
+        columns: Dict[str, Any],
         address: str
     ) -> Optional[Dict[str, Any]]:
         """
@@ -296,172 +617,125 @@ class PatternMatcher:
         eth_threshold = thresholds.get("ETH", 10.0)
         
         # Find transactions close to threshold
-        suspicious_txs = []
-        for tx in transactions:
-            if tx.get("from", "").lower() != address.lower():
-                continue
-            
-            amount = tx.get("value", 0)
-            if 0.9 * eth_threshold <= amount < eth_threshold:
-                suspicious_txs.append(tx)
+        rows = columns["from_idx"]
+        amounts = columns["value"][rows]
+        near_threshold = (amounts >= 0.9 * eth_threshold) & (amounts < eth_threshold)
         
-        if len(suspicious_txs) < 3:  # Need at least 3 occurrences
+        if np.count_nonzero(near_threshold) < 3:  # Need at least 3 occurrences
             return None
         
         # Check if pattern repeats over time (within a week)
-        timestamps = []
-        for tx in suspicious_txs:
-            ts = tx.get("timestamp")
-            if isinstance(ts, str):
-                ts = datetime.fromisoformat(ts.replace('Z', '+00:00'))
-            timestamps.append(ts)
-        
-        if timestamps:
-            time_span = (max(timestamps) - min(timestamps)).total_seconds()
-            if time_span > 604800:  # More than 1 week
-                return None
+        rows = rows[near_threshold]
+        if np.ptp(columns["ts"][rows]) > 604800 * _NS_PER_SECOND:  # More than 1 week
+            return None
         
         # Pattern detected
-        confidence = min(len(suspicious_txs) / 5, 1.0)
+        confidence = min(rows.size / 5, 1.0)
+        amounts = amounts[near_threshold]
         
         return {
-            "pattern_id": pattern["id"],
-            "pattern_name": pattern["name"],
-            "pattern_name_ja": pattern["name_ja"],
-            "pattern_name_en": pattern["name_en"],
-            "description_ja": pattern["description_ja"],
-            "description_en": pattern["description_en"],
-            "risk_level": pattern["risk_level"],
+            **self._templates[pattern["id"]],
             "confidence": confidence,
-            "addresses_count": len(set(tx.get("to") for tx in suspicious_txs)),
-            "total_amount": sum(tx.get("value", 0) for tx in suspicious_txs),
-            "transaction_count": len(suspicious_txs),
+            "addresses_count": np.unique(columns["to"][rows]).size,
+            "total_amount": float(amounts.sum()),
+            "transaction_count": int(rows.size),
             "threshold": eth_threshold,
             "evidence": {
-                "transaction_hashes": [tx.get("hash") for tx in suspicious_txs],
-                "amounts": [tx.get("value") for tx in suspicious_txs]
+                "transaction_hashes": columns["hash"][rows].tolist(),
+                "amounts": amounts.tolist()
             }
         }
     
     def _detect_circular_trading(
         self,
         pattern: Dict[str, Any],
-        transactions: List[Dict[str, Any]],
+        columns: Dict[str, Any],
         address: str
     ) -> Optional[Dict[str, Any]]:
         """
         Detect circular trading: funds return to original address
         循環取引検出：資金が元のアドレスに戻る
         """
-        # Build chains and check for cycles
-        chains = self._build_transaction_chains(transactions, address, max_hops=10)
+        # First cycle from the walk shared with layering
+        chain = columns["chains"].get(pattern["id"])
+        if chain is None:
+            return None
         
-        for chain in chains:
-            if len(chain) < 3:
-                continue
-            
-            # Check if last transaction returns to original address
-            last_to = chain[-1].get("to", "").lower()
-            if last_to != address.lower():
-                continue
-            
-            # Check timeframe
-            first_time = chain[0].get("timestamp")
-            last_time = chain[-1].get("timestamp")
-            
-            if isinstance(first_time, str):
-                first_time = datetime.fromisoformat(first_time.replace('Z', '+00:00'))
-            if isinstance(last_time, str):
-                last_time = datetime.fromisoformat(last_time.replace('Z', '+00:00'))
-            
-            time_diff = (last_time - first_time).total_seconds()
-            if time_diff > 172800:  # More than 48 hours
-                continue
-            
-            # Pattern detected
-            confidence = min(len(chain) / 6, 1.0)
-            
-            return {
-                "pattern_id": pattern["id"],
-                "pattern_name": pattern["name"],
-                "pattern_name_ja": pattern["name_ja"],
-                "pattern_name_en": pattern["name_en"],
-                "description_ja": pattern["description_ja"],
-                "description_en": pattern["description_en"],
-                "risk_level": pattern["risk_level"],
-                "confidence": confidence,
-                "addresses_count": len(chain),
-                "total_amount": sum(tx.get("value", 0) for tx in chain),
-                "cycle_length": len(chain),
-                "timeframe_seconds": int(time_diff),
-                "evidence": {
-                    "transaction_hashes": [tx.get("hash") for tx in chain]
-                }
-            }
+        timestamps = columns["ts"]
+        time_diff = (timestamps[chain[-1]] - timestamps[chain[0]]) / _NS_PER_SECOND
         
-        return None
+        # Pattern detected
+        confidence = min(len(chain) / 6, 1.0)
+        
+        return {
+            **self._templates[pattern["id"]],
+            "confidence": confidence,
+            "addresses_count": len(chain),
+            "total_amount": float(columns["value"][chain].sum()),
+            "cycle_length": len(chain),
+            "timeframe_seconds": int(time_diff),
+            "evidence": {
+                "transaction_hashes": columns["hash"][chain].tolist()
+            }
+        }
     
     def _detect_rapid_movement(
         self,
         pattern: Dict[str, Any],
-        transactions: List[Dict[str, Any]],
+        columns: Dict[str, Any],
         address: str
     ) -> Optional[Dict[str, Any]]:
         """
         Detect rapid movement: funds transferred immediately after receipt
         急速移動検出：受取直後の転送
         """
-        # Group incoming and outgoing transactions
-        incoming = [tx for tx in transactions if tx.get("to", "").lower() == address.lower()]
-        outgoing = [tx for tx in transactions if tx.get("from", "").lower() == address.lower()]
-        
-        rapid_movements = []
-        
-        for in_tx in incoming:
-            in_time = in_tx.get("timestamp")
-            if isinstance(in_time, str):
-                in_time = datetime.fromisoformat(in_time.replace('Z', '+00:00'))
-            
-            in_amount = in_tx.get("value", 0)
-            
-            # Find outgoing transactions within 5 minutes
-            for out_tx in outgoing:
-                out_time = out_tx.get("timestamp")
-                if isinstance(out_time, str):
-                    out_time = datetime.fromisoformat(out_time.replace('Z', '+00:00'))
-                
-                time_diff = (out_time - in_time).total_seconds()
-                if 0 < time_diff <= 300:  # Within 5 minutes
-                    out_amount = out_tx.get("value", 0)
-                    if out_amount >= 0.95 * in_amount:  # 95% or more of received amount
-                        rapid_movements.append((in_tx, out_tx, time_diff))
-        
-        if not rapid_movements:
+        # Incoming and outgoing transactions, each sorted by time
+        timestamps = columns["ts"]
+        values = columns["value"]
+        incoming = columns["to_idx"]
+        outgoing = columns["from_idx"]
+        incoming = incoming[timestamps[incoming] != _NAT]
+        outgoing = outgoing[timestamps[outgoing] != _NAT]
+        incoming = incoming[np.argsort(timestamps[incoming], kind="stable")]
+        outgoing = outgoing[np.argsort(timestamps[outgoing], kind="stable")]
+        
+        # Outgoing within 5 minutes forwarding 95% or more of the received amount
+        in_pos, out_pos = _rapid_movement_pairs(
+            timestamps[incoming], values[incoming],
+            timestamps[outgoing], values[outgoing],
+            _RAPID_MOVEMENT_WINDOW_NS
+        )
+        if not in_pos.size:
             return None
         
+        # Report movements in transaction order
+        in_rows = incoming[in_pos]
+        out_rows = outgoing[out_pos]
+        order = np.lexsort((out_rows, in_rows))
+        in_rows = in_rows[order]
+        out_rows = out_rows[order]
+        time_diffs = (timestamps[out_rows[:5]] - timestamps[in_rows[:5]]) // _NS_PER_SECOND
+        
         # Pattern detected
-        confidence = min(len(rapid_movements) / 3, 1.0)
+        confidence = min(in_rows.size / 3, 1.0)
+        hashes = columns["hash"]
         
         return {
-            "pattern_id": pattern["id"],
-            "pattern_name": pattern["name"],
-            "pattern_name_ja": pattern["name_ja"],
-            "pattern_name_en": pattern["name_en"],
-            "description_ja": pattern["description_ja"],
-            "description_en": pattern["description_en"],
-            "risk_level": pattern["risk_level"],
+            **self._templates[pattern["id"]],
             "confidence": confidence,
-            "addresses_count": len(set(out_tx.get("to") for _, out_tx, _ in rapid_movements)),
-            "total_amount": sum(in_tx.get("value", 0) for in_tx, _, _ in rapid_movements),
-            "occurrence_count": len(rapid_movements),
+            "addresses_count": np.unique(columns["to"][out_rows]).size,
+            "total_amount": float(values[in_rows].sum()),
+            "occurrence_count": int(in_rows.size),
             "evidence": {
                 "movements": [
                     {
-                        "incoming_tx": in_tx.get("hash"),
-                        "outgoing_tx": out_tx.get("hash"),
-                        "time_diff_seconds": int(time_diff)
+                        "incoming_tx": hashes[in_row],
+                        "outgoing_tx": hashes[out_row],
+                        "time_diff_seconds": time_diff
                     }
-                    for in_tx, out_tx, time_diff in rapid_movements[:5]  # First 5
+                    for in_row, out_row, time_diff in zip(
+                        in_rows[:5].tolist(), out_rows[:5].tolist(), time_diffs.tolist()
+                    )  # First 5
                 ]
             }
         }
@@ -469,54 +743,46 @@ class PatternMatcher:
     def _detect_dusting(
         self,
         pattern: Dict[str, Any],
-        transactions: List[Dict[str, Any]],
+        columns: Dict[str, Any],
         address: str
     ) -> Optional[Dict[str, Any]]:
         """
         Detect dusting attack: tiny amounts to many addresses
         ダスティング攻撃検出：極小額を多数のアドレスへ
         """
-        # Find outgoing transactions with tiny amounts
-        dust_txs = []
-        recipients = set()
-        
-        for tx in transactions:
-            if tx.get("from", "").lower() != address.lower():
-                continue
-            
-            amount = tx.get("value", 0)
-            if amount <= 0.001:  # 0.001 ETH or less
-                dust_txs.append(tx)
-                recipients.add(tx.get("to", "").lower())
+        # Find outgoing transactions with tiny amounts (0.001 ETH or less)
+        dust_rows = columns["from_idx"]
+        amounts = columns["value"][dust_rows]
+        is_dust = amounts <= 0.001
         
-        if len(recipients) < 100:  # Need at least 100 unique recipients
+        # Need at least 100 unique recipients
+        if np.count_nonzero(is_dust) < 100:
+            return None
+        dust_rows = dust_rows[is_dust]
+        recipient_count = np.unique(columns["to"][dust_rows]).size
+        if recipient_count < 100:
             return None
         
         # Pattern detected
-        confidence = min(len(recipients) / 200, 1.0)
+        confidence = min(recipient_count / 200, 1.0)
+        amounts = amounts[is_dust]
         
         return {
-            "pattern_id": pattern["id"],
-            "pattern_name": pattern["name"],
-            "pattern_name_ja": pattern["name_ja"],
-            "pattern_name_en": pattern["name_en"],
-            "description_ja": pattern["description_ja"],
-            "description_en": pattern["description_en"],
-            "risk_level": pattern["risk_level"],
+            **self._templates[pattern["id"]],
             "confidence": confidence,
-            "addresses_count": len(recipients),
-            "total_amount": sum(tx.get("value", 0) for tx in dust_txs),
-            "transaction_count": len(dust_txs),
+            "addresses_count": recipient_count,
+            "total_amount": float(amounts.sum()),
+            "transaction_count": int(dust_rows.size),
             "evidence": {
-                "transaction_hashes": [tx.get("hash") for tx in dust_txs[:10]],
-                "average_dust_amount": statistics.mean([tx.get("value", 0) for tx in dust_txs])
+                "transaction_hashes": columns["hash"][dust_rows[:10]].tolist(),
+                "average_dust_amount": float(amounts.mean())
             }
         }
     
     def _detect_peel_chain(
         self,
         pattern: Dict[str, Any],
-        transactions: List[Dict[str, Any]],
+        columns: Dict[str, Any],
         address: str
     ) -> Optional[Dict[str, Any]]:
         """
@@ -524,92 +790,175 @@ class PatternMatcher:
         ピールチェーン検出：大きな資金プールから段階的に剥離
         """
         # Find sequential outgoing transactions from same address
-        outgoing = sorted(
-            [tx for tx in transactions if tx.get("from", "").lower() == address.lower()],
-            key=lambda x: x.get("timestamp", "")
-        )
+        outgoing = columns["from_idx"]
         
-        if len(outgoing) < 5:  # Need at least 5 transactions
+        if outgoing.size < 5:  # Need at least 5 transactions
             return None
         
-        # Track balance changes
-        peels = []
-        for i, tx in enumerate(outgoing):
-            if i == 0:
-                continue
-            
-            # Check if this looks like a peel (portion of balance)
-            amount = tx.get("value", 0)
-            if 0 < amount < 100:  # Reasonable peel amount
-                peels.append(tx)
+        outgoing = outgoing[np.argsort(columns["ts"][outgoing], kind="stable")]
+        
+        # Track balance changes, skipping the first transaction
+        amounts = columns["value"][outgoing[1:]]
+        is_peel = (amounts > 0) & (amounts < 100)  # Reasonable peel amount
+        peels = outgoing[1:][is_peel]
         
-        if len(peels) < 5:
+        if peels.size < 5:
             return None
         
         # Pattern detected
-        confidence = min(len(peels) / 10, 1.0)
+        confidence = min(peels.size / 10, 1.0)
+        amounts = amounts[is_peel]
         
         return {
-            "pattern_id": pattern["id"],
-            "pattern_name": pattern["name"],
-            "pattern_name_ja": pattern["name_ja"],
-            "pattern_name_en": pattern["name_en"],
-            "description_ja": pattern["description_ja"],
-            "description_en": pattern["description_en"],
-            "risk_level": pattern["risk_level"],
+            **self._templates[pattern["id"]],
             "confidence": confidence,
-            "addresses_count": len(set(tx.get("to") for tx in peels)),
-            "total_amount": sum(tx.get("value", 0) for tx in peels),
-            "peel_count": len(peels),
+            "addresses_count": np.unique(columns["to"][peels]).size,
+            "total_amount": float(amounts.sum()),
+            "peel_count": int(peels.size),
             "evidence": {
-                "transaction_hashes": [tx.get("hash") for tx in peels[:10]],
-                "peel_amounts": [tx.get("value") for tx in peels[:10]]
+                "transaction_hashes": columns["hash"][peels[:10]].tolist(),
+                "peel_amounts": amounts[:10].tolist()
             }
         }
     
+    def _find_chains(
+        self,
+        columns: Dict[str, Any],
+        address: str,
+        pattern_ids: List[str]
+    ) -> Dict[str, List[int]]:
+        """
+        Find the first matching chain for each chain pattern
+        チェーン系パターンの候補を検出
+        
+        Patterns in _CLOSED_CHAIN_PATTERNS share one walk pruned to chains
+        that can return to the address. The others share an unpruned walk,
+        which stops after MAX_CHAIN_EXPANSIONS queued chains.
+        
+        Args:
+            columns: Column-wise transactions from _normalize
+            address: Target address (lowercase)
+            pattern_ids: Chain patterns to look for (keys of _CHAIN_PREDICATES)
+        
+        Returns:
+            First matching chain (row indices) for each pattern that has one
+        """
+        found = {}
+        pruned = [pattern_id for pattern_id in pattern_ids if pattern_id in _CLOSED_CHAIN_PATTERNS]
+        unpruned = [pattern_id for pattern_id in pattern_ids if pattern_id not in _CLOSED_CHAIN_PATTERNS]
+        
+        def recorder(wanted: List[str]) -> Callable[[List[int]], bool]:
+            def record(chain: List[int]) -> bool:
+                for pattern_id in wanted:
+                    if pattern_id not in found and _CHAIN_PREDICATES[pattern_id](columns, address, chain):
+                        found[pattern_id] = chain
+                return all(pattern_id in found for pattern_id in wanted)
+            return record
+        
+        if pruned:
+            self._build_transaction_chains(
+                columns, address, max_hops=10, should_stop=recorder(pruned), end_address=address
+            )
+        if unpruned:
+            self._build_transaction_chains(
+                columns, address, max_hops=10, should_stop=recorder(unpruned),
+                max_expansions=self.MAX_CHAIN_EXPANSIONS
+            )
+        return found
+    
     def _build_transaction_chains(
         self,
-        transactions: List[Dict[str, Any]],
+        columns: Dict[str, Any],
         start_address: str,
-        max_hops: int = 10
-    ) -> List[List[Dict[str, Any]]]:
+        max_hops: int = 10,
+        should_stop: Optional[Callable[[List[int]], bool]] = None,
+        end_address: Optional[str] = None,
+        max_expansions: Optional[int] = None
+    ) -> List[List[int]]:
         """
         Build transaction chains starting from given address
         
+        Chains are simple paths: no address is visited twice, except that
+        a transfer back to the start address closes the chain.
+        
         Args:
-            transactions: List of all transactions
-            start_address: Starting address
+            columns: Column-wise transactions from _normalize
+            start_address: Starting address (lowercase)
             max_hops: Maximum chain length
+            should_stop: Optional predicate; the search ends at the first
+                chain it accepts, which is returned as the last element
+            end_address: If given, only follow transactions from which
+                this address can still be reached within max_hops hops
+            max_expansions: If given, stop once this many chains have been
+                queued (the chains found so far are returned)
         
         Returns:
-            List of transaction chains
+            List of transaction chains (row indices into columns)
         """
-        # Build adjacency map
-        adj_map = defaultdict(list)
-        for tx in transactions:
-            from_addr = tx.get("from", "").lower()
-            adj_map[from_addr].append(tx)
-        
-        # BFS to build chains
+        adj_map = columns["outgoing"]
+        to_addrs = columns["to"].tolist()
+        
+        if end_address is not None:
+            # Reachability is memoized per (address, hops left), so shared
+            # sub-paths are checked once instead of once per chain prefix
+            @lru_cache(maxsize=None)
+            def reaches_end(addr: str, hops_left: int) -> bool:
+                if addr == end_address:
+                    return True
+                if not hops_left:
+                    return False
+                return any(
+                    reaches_end(to_addrs[row], hops_left - 1)
+                    for row in adj_map.get(addr, ())
+                )
+        
+        def next_rows(addr: str, length: int) -> List[int]:
+            rows = adj_map.get(addr, [])
+            if end_address is None:
+                return rows
+            return [row for row in rows if reaches_end(to_addrs[row], max_hops - length - 1)]
+        
+        # BFS to build chains, carrying the addresses each chain has visited
         chains = []
-        queue = [([tx], tx.get("to", "").lower()) for tx in adj_map[start_address.lower()]]
+        queue = deque()
+        start_visited = frozenset((start_address,))
+        for row in next_rows(start_address, 0):
+            queue.append(([row], to_addrs[row], start_visited | {to_addrs[row]}))
+        expansions = len(queue)
         
         while queue:
-            chain, current_addr = queue.pop(0)
+            if max_expansions is not None and expansions > max_expansions:
+                logger.debug(
+                    f"Chain walk from {start_address} stopped after {max_expansions} chains"
+                )
+                break
             
-            if len(chain) >= max_hops:
-                chains.append(chain)
-                continue
+            chain, current_addr, visited = queue.popleft()
             
-            # Find next transactions
-            next_txs = adj_map.get(current_addr, [])
-            if not next_txs:
-                if len(chain) >= 3:  # Only keep chains with at least 3 hops
-                    chains.append(chain)
+            if current_addr == start_address:
+                # Funds are back at the start, which closes the chain
+                if len(chain) < 3:
+                    continue
+                chains.append(chain)
+            elif len(chain) >= max_hops:
+                chains.append(chain)
             else:
-                for next_tx in next_txs:
-                    new_chain = chain + [next_tx]
-                    new_addr = next_tx.get("to", "").lower()
-                    queue.append((new_chain, new_addr))
+                # Find next transactions to addresses not yet on the chain
+                extended = False
+                for next_row in next_rows(current_addr, len(chain)):
+                    next_addr = to_addrs[next_row]
+                    if next_addr in visited and next_addr != start_address:
+                        continue
+                    queue.append((chain + [next_row], next_addr, visited | {next_addr}))
+                    expansions += 1
+                    extended = True
+                if extended:
+                    continue
+                if len(chain) < 3:  # Only keep chains with at least 3 hops
+                    continue
+                chains.append(chain)
+            
+            if should_stop is not None and should_stop(chain):
+                break
         
         return chains
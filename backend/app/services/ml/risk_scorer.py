@@ -3,18 +3,155 @@ Risk Scorer for blockchain address assessment
 ブロックチェーンアドレスのリスク評価
 """
 import logging
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import multiprocessing
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterable, List, Dict, Any, NamedTuple, Optional
+from datetime import datetime, timezone
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 
+class RiskJob(NamedTuple):
+    """
+    Inputs for scoring one address in RiskScorer.score_many
+    一括スコアリング用の1アドレス分の入力
+    """
+    address: str
+    transactions: List[Dict[str, Any]]
+    detected_patterns: List[Dict[str, Any]]
+    detected_anomalies: List[Dict[str, Any]]
+    address_metadata: Optional[Dict[str, Any]] = None
+
+
+class TransactionFeatures(NamedTuple):
+    """
+    Per-address aggregates used by the transaction-based risk components
+    取引ベースのリスク要素で使う集計値
+    """
+    transaction_count: int
+    total_volume: float
+    high_risk_interactions: int
+    first_timestamp: Optional[datetime]  # Naive UTC, None if no timestamps
+    last_timestamp: Optional[datetime]
+
+
+def _extract_features(
+    transactions: List[Dict[str, Any]],
+    known_high_risk: frozenset
+) -> TransactionFeatures:
+    """
+    Collect volume, counterparty and timing aggregates in one pass
+    
+    Args:
+        transactions: List of transactions
+        known_high_risk: Lowercased known high-risk addresses
+    
+    Returns:
+        Aggregates for the counterparty, volume and age risk components
+    """
+    total_volume = 0
+    high_risk_interactions = 0
+    first_ts = None
+    last_ts = None
+    
+    for tx in transactions:
+        total_volume += tx.get("value", 0)
+        
+        if ((tx.get("from") or "").lower() in known_high_risk
+                or (tx.get("to") or "").lower() in known_high_risk):
+            high_risk_interactions += 1
+        
+        ts = tx.get("timestamp")
+        if ts is None:
+            continue
+        if isinstance(ts, str):
+            ts = datetime.fromisoformat(ts.replace('Z', '+00:00'))
+        if ts.tzinfo is not None:
+            # Compare in naive UTC, like datetime.utcnow()
+            ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+        if first_ts is None or ts < first_ts:
+            first_ts = ts
+        if last_ts is None or ts > last_ts:
+            last_ts = ts
+    
+    return TransactionFeatures(
+        len(transactions), total_volume, high_risk_interactions, first_ts, last_ts
+    )
+
+
+# Scorer owned by each worker process, created by _init_worker
+_worker_scorer: Optional["RiskScorer"] = None
+
+
+def _init_worker(weights: Dict[str, float], known_high_risk: frozenset) -> None:
+    """Create the worker's scorer with the parent's weights and known entities"""
+    global _worker_scorer
+    RiskScorer.KNOWN_HIGH_RISK = known_high_risk
+    _worker_scorer = RiskScorer()
+    _worker_scorer.weights = weights
+
+
+def _score_one(job: RiskJob, now: datetime) -> Dict[str, Any]:
+    """Score one address in a worker process"""
+    return _worker_scorer.calculate_risk_score(*job, now=now)
+
+
 class RiskScorer:
     """
     Comprehensive risk scoring system for blockchain addresses
     ブロックチェーンアドレスの総合的なリスクスコアリングシステム
     """
     
+    # Known high-risk entities (simplified - would be in database in production)
+    # 比較用に小文字で保持
+    KNOWN_HIGH_RISK = frozenset(addr.lower() for addr in (
+        "0xd90e2f925DA726b50C4Ed8D0Fb90Ad053324F31b",  # Tornado Cash
+        "0x47CE0C6eD5B0Ce3d3A51fdb1C52DC66a7c3c2936",  # Tornado Cash
+        # Add more known addresses
+    ))
+    
+    # Total volume thresholds (in ETH, exclusive) and the risk above each
+    VOLUME_THRESHOLDS = (1, 10, 100, 1000)
+    VOLUME_RISKS = (10, 20, 40, 60, 80)
+    
+    # Transaction count thresholds (exclusive) and the volume risk multiplier above each
+    COUNT_THRESHOLDS = (100, 1000)
+    COUNT_MULTIPLIERS = (1, 1.1, 1.2)
+    
+    # Address age bounds in days; new addresses are higher risk
+    AGE_DAY_BOUNDS = (7, 30, 90, 365)
+    AGE_RISKS = (80, 60, 40, 20, 10)  # Very new, new, relatively new, established, old/trusted
+    
+    # Score bands: lower bound of each level above "minimal"
+    RISK_LEVEL_BOUNDS = (20, 40, 60, 80)
+    RISK_LEVELS = ("minimal", "low", "medium", "high", "critical")
+    
+    # リスクレベルの表示名
+    TRANSLATIONS = {
+        "ja": {
+            "critical": "極めて高い",
+            "high": "高い",
+            "medium": "中程度",
+            "low": "低い",
+            "minimal": "極めて低い"
+        },
+        "en": {
+            "critical": "Critical",
+            "high": "High",
+            "medium": "Medium",
+            "low": "Low",
+            "minimal": "Minimal"
+        }
+    }
+    
+    # Below this many addresses score_many runs in-process, since starting
+    # worker processes costs more than it saves
+    PARALLEL_MIN_JOBS = 64
+    
     def __init__(self):
         """Initialize risk scorer with default weights"""
         # Risk factor weights (total should be 1.0)
@@ -26,15 +163,35 @@ class RiskScorer:
             "age_risk": 0.10           # Address age and activity
         }
         
+        # リスクレベル/重大度ごとの重み（未知の値は medium 扱い）
+        self._level_index = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+        self._level_weights = np.array([1.0, 0.75, 0.5, 0.25])
+        
         logger.info("Initialized RiskScorer with default weights")
     
+    @classmethod
+    def update_known_high_risk(cls, addresses: Iterable[str]) -> None:
+        """
+        Replace the known high-risk addresses (e.g. after a list refresh)
+        既知の高リスクアドレス一覧を更新
+        
+        The set is swapped in one assignment, so concurrent scoring sees
+        either the old or the new list.
+        
+        Args:
+            addresses: Known high-risk addresses (any case)
+        """
+        cls.KNOWN_HIGH_RISK = frozenset(addr.lower() for addr in addresses)
+    
     def calculate_risk_score(
         self,
         address: str,
         transactions: List[Dict[str, Any]],
         detected_patterns: List[Dict[str, Any]],
         detected_anomalies: List[Dict[str, Any]],
-        address_metadata: Optional[Dict[str, Any]] = None
+        address_metadata: Optional[Dict[str, Any]] = None,
+        *,
+        now: Optional[datetime] = None
     ) -> Dict[str, Any]:
         """
         Calculate comprehensive risk score for an address
@@ -45,16 +202,21 @@ class RiskScorer:
             detected_patterns: Detected ML patterns
             detected_anomalies: Detected anomalies
             address_metadata: Additional address metadata
+            now: Assessment time in naive UTC (defaults to the current time)
         
         Returns:
             Risk assessment dictionary with score and breakdown
         """
+        if now is None:
+            now = datetime.utcnow()
+        
         # Calculate individual risk components
         pattern_score = self._calculate_pattern_risk(detected_patterns)
         anomaly_score = self._calculate_anomaly_risk(detected_anomalies)
-        counterparty_score = self._calculate_counterparty_risk(transactions)
-        volume_score = self._calculate_volume_risk(transactions)
-        age_score = self._calculate_age_risk(transactions, address_metadata)
+        features = _extract_features(transactions, self.KNOWN_HIGH_RISK)
+        counterparty_score = self._calculate_counterparty_risk(features)
+        volume_score = self._calculate_volume_risk(features)
+        age_score = self._calculate_age_risk(features, address_metadata, now=now)
         
         # Calculate weighted total
         total_score = (
@@ -125,12 +287,46 @@ class RiskScorer:
             "total_patterns_detected": len(detected_patterns),
             "total_anomalies_detected": len(detected_anomalies),
             "recommendations": recommendations,
-            "assessed_at": datetime.utcnow().isoformat()
+            "assessed_at": now.isoformat()
         }
         
         logger.info(f"Calculated risk score for {address}: {total_score} ({risk_level})")
         return result
     
+    def score_many(
+        self,
+        jobs: List[RiskJob],
+        max_workers: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Calculate risk scores for many addresses
+        複数アドレスのリスクスコアを一括計算
+        
+        Each address is independent, so large batches are spread across
+        worker processes. All addresses are assessed at the same time.
+        
+        Args:
+            jobs: Inputs for each address
+            max_workers: Worker processes (defaults to the CPU count)
+        
+        Returns:
+            Risk assessments in the same order as jobs
+        """
+        now = datetime.utcnow()
+        
+        if len(jobs) < self.PARALLEL_MIN_JOBS:
+            return [self.calculate_risk_score(*job, now=now) for job in jobs]
+        
+        # Spawned workers start with fresh interpreter state, so no locks
+        # (logging handlers, thread pools) are inherited mid-use from the parent
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.weights, self.KNOWN_HIGH_RISK)
+        ) as executor:
+            return list(executor.map(partial(_score_one, now=now), jobs, chunksize=32))
+    
     def _calculate_pattern_risk(
         self,
         detected_patterns: List[Dict[str, Any]]
@@ -148,20 +344,18 @@ class RiskScorer:
             return 0.0
         
         # Weight patterns by risk level and confidence
-        risk_weights = {
-            "critical": 1.0,
-            "high": 0.75,
-            "medium": 0.5,
-            "low": 0.25
-        }
-        
-        total_risk = 0.0
-        for pattern in detected_patterns:
-            risk_level = pattern.get("risk_level", "medium")
-            confidence = pattern.get("confidence", 0.5)
-            
-            pattern_risk = risk_weights.get(risk_level, 0.5) * confidence
-            total_risk += pattern_risk
+        count = len(detected_patterns)
+        levels = np.fromiter(
+            (self._level_index.get(p.get("risk_level", "medium"), 2) for p in detected_patterns),
+            dtype=np.int8,
+            count=count
+        )
+        confidences = np.fromiter(
+            (p.get("confidence", 0.5) for p in detected_patterns),
+            dtype=np.float64,
+            count=count
+        )
+        total_risk = float(np.dot(self._level_weights[levels], confidences))
         
         # Normalize to 0-100 scale
         # Multiple patterns increase risk, but cap at 100
@@ -185,18 +379,12 @@ class RiskScorer:
         if not detected_anomalies:
             return 0.0
         
-        severity_weights = {
-            "critical": 1.0,
-            "high": 0.75,
-            "medium": 0.5,
-            "low": 0.25
-        }
-        
-        total_risk = 0.0
-        for anomaly in detected_anomalies:
-            severity = anomaly.get("severity", "medium")
-            anomaly_risk = severity_weights.get(severity, 0.5)
-            total_risk += anomaly_risk
+        severities = np.fromiter(
+            (self._level_index.get(a.get("severity", "medium"), 2) for a in detected_anomalies),
+            dtype=np.int8,
+            count=len(detected_anomalies)
+        )
+        total_risk = float(self._level_weights[severities].sum())
         
         # Normalize to 0-100 scale
         score = min(total_risk * 30, 100)
@@ -205,44 +393,22 @@ class RiskScorer:
     
     def _calculate_counterparty_risk(
         self,
-        transactions: List[Dict[str, Any]]
+        features: TransactionFeatures
     ) -> float:
         """
         Calculate risk based on counterparty interactions
         
         Args:
-            transactions: List of transactions
+            features: Transaction aggregates from _extract_features
         
         Returns:
             Risk score (0-100)
         """
-        if not transactions:
-            return 0.0
-        
-        # Known high-risk entities (simplified - would be in database in production)
-        known_high_risk = set([
-            "0xd90e2f925DA726b50C4Ed8D0Fb90Ad053324F31b",  # Tornado Cash
-            "0x47CE0C6eD5B0Ce3d3A51fdb1C52DC66a7c3c2936",  # Tornado Cash
-            # Add more known addresses
-        ])
-        
-        high_risk_interactions = 0
-        total_interactions = 0
-        
-        for tx in transactions:
-            from_addr = tx.get("from", "").lower()
-            to_addr = tx.get("to", "").lower()
-            
-            total_interactions += 1
-            
-            if from_addr in known_high_risk or to_addr in known_high_risk:
-                high_risk_interactions += 1
-        
-        if total_interactions == 0:
+        if not features.high_risk_interactions:
             return 0.0
         
         # Calculate risk ratio
-        risk_ratio = high_risk_interactions / total_interactions
+        risk_ratio = features.high_risk_interactions / features.transaction_count
         
         # Convert to 0-100 scale
         score = risk_ratio * 100
@@ -251,104 +417,65 @@ class RiskScorer:
     
     def _calculate_volume_risk(
         self,
-        transactions: List[Dict[str, Any]]
+        features: TransactionFeatures
     ) -> float:
         """
         Calculate risk based on transaction volume
         
         Args:
-            transactions: List of transactions
+            features: Transaction aggregates from _extract_features
         
         Returns:
             Risk score (0-100)
         """
-        if not transactions:
+        if not features.transaction_count:
             return 0.0
         
-        total_volume = sum(tx.get("value", 0) for tx in transactions)
-        transaction_count = len(transactions)
-        
-        # Risk thresholds (in ETH)
-        volume_thresholds = {
-            "very_high": 1000,  # > 1000 ETH
-            "high": 100,        # > 100 ETH
-            "medium": 10,       # > 10 ETH
-            "low": 1            # > 1 ETH
-        }
-        
-        # Calculate volume risk
-        if total_volume > volume_thresholds["very_high"]:
-            volume_risk = 80
-        elif total_volume > volume_thresholds["high"]:
-            volume_risk = 60
-        elif total_volume > volume_thresholds["medium"]:
-            volume_risk = 40
-        elif total_volume > volume_thresholds["low"]:
-            volume_risk = 20
-        else:
-            volume_risk = 10
+        # Calculate volume risk from the number of thresholds exceeded
+        volume_risk = self.VOLUME_RISKS[bisect_left(self.VOLUME_THRESHOLDS, features.total_volume)]
         
         # Adjust for transaction count (more transactions = potentially higher risk)
-        if transaction_count > 1000:
-            volume_risk = min(volume_risk * 1.2, 100)
-        elif transaction_count > 100:
-            volume_risk = min(volume_risk * 1.1, 100)
+        multiplier = self.COUNT_MULTIPLIERS[
+            bisect_left(self.COUNT_THRESHOLDS, features.transaction_count)
+        ]
+        volume_risk = min(volume_risk * multiplier, 100)
         
         return round(volume_risk, 2)
     
     def _calculate_age_risk(
         self,
-        transactions: List[Dict[str, Any]],
-        address_metadata: Optional[Dict[str, Any]] = None
+        features: TransactionFeatures,
+        address_metadata: Optional[Dict[str, Any]] = None,
+        *,
+        now: Optional[datetime] = None
     ) -> float:
         """
         Calculate risk based on address age and activity pattern
         
         Args:
-            transactions: List of transactions
+            features: Transaction aggregates from _extract_features
             address_metadata: Additional metadata
+            now: Assessment time in naive UTC (defaults to the current time)
         
         Returns:
             Risk score (0-100)
         """
-        if not transactions:
+        first_tx = features.first_timestamp
+        last_tx = features.last_timestamp
+        if first_tx is None:
             return 50.0  # Unknown age = medium risk
         
-        # Sort transactions by timestamp
-        sorted_txs = sorted(
-            transactions,
-            key=lambda x: x.get("timestamp", "")
-        )
-        
-        if not sorted_txs:
-            return 50.0
-        
         # Calculate address age
-        first_tx = sorted_txs[0].get("timestamp")
-        last_tx = sorted_txs[-1].get("timestamp")
-        
-        if isinstance(first_tx, str):
-            first_tx = datetime.fromisoformat(first_tx.replace('Z', '+00:00'))
-        if isinstance(last_tx, str):
-            last_tx = datetime.fromisoformat(last_tx.replace('Z', '+00:00'))
-        
-        age_days = (datetime.utcnow() - first_tx).days
+        if now is None:
+            now = datetime.utcnow()
+        age_days = (now - first_tx).days
         activity_days = (last_tx - first_tx).days + 1
         
         # New addresses are higher risk
-        if age_days < 7:
-            age_risk = 80  # Very new
-        elif age_days < 30:
-            age_risk = 60  # New
-        elif age_days < 90:
-            age_risk = 40  # Relatively new
-        elif age_days < 365:
-            age_risk = 20  # Established
-        else:
-            age_risk = 10  # Old/trusted
+        age_risk = self.AGE_RISKS[bisect_right(self.AGE_DAY_BOUNDS, age_days)]
         
         # Inactive addresses are also risky (dormant then suddenly active)
-        inactivity_ratio = (datetime.utcnow() - last_tx).days / max(age_days, 1)
+        inactivity_ratio = (now - last_tx).days / max(age_days, 1)
         if inactivity_ratio > 0.5:  # More than 50% of life inactive
             age_risk = min(age_risk * 1.3, 100)
         
@@ -364,16 +491,7 @@ class RiskScorer:
         Returns:
             Risk level category
         """
-        if score >= 80:
-            return "critical"
-        elif score >= 60:
-            return "high"
-        elif score >= 40:
-            return "medium"
-        elif score >= 20:
-            return "low"
-        else:
-            return "minimal"
+        return self.RISK_LEVELS[bisect_right(self.RISK_LEVEL_BOUNDS, score)]
     
     def _translate_risk_level(self, risk_level: str, language: str) -> str:
         """
@@ -386,24 +504,7 @@ class RiskScorer:
         Returns:
             Translated risk level
         """
-        translations = {
-            "ja": {
-                "critical": "極めて高い",
-                "high": "高い",
-                "medium": "中程度",
-                "low": "低い",
-                "minimal": "極めて低い"
-            },
-            "en": {
-                "critical": "Critical",
-                "high": "High",
-                "medium": "Medium",
-                "low": "Low",
-                "minimal": "Minimal"
-            }
-        }
-        
-        return translations.get(language, {}).get(risk_level, risk_level)
+        return self.TRANSLATIONS.get(language, {}).get(risk_level, risk_level)
     
     def _generate_recommendations(
         self,
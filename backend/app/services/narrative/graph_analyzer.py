@@ -4,12 +4,134 @@ Graph Analyzer for transaction flow analysis
 """
 import logging
 from typing import List, Dict, Any, Optional, Tuple, Set
-from collections import defaultdict, deque
-from datetime import datetime
+from datetime import datetime, timezone
+
+import numpy as np
+
+try:
+    from numba import njit, typed, types
+except ImportError:  # numba is optional; run the search in plain Python
+    njit = None
 
 logger = logging.getLogger(__name__)
 
 
+def _main_paths_kernel(
+    indptr, edge_ids, edge_to, hash_ids, amounts, start, max_paths, max_hops, visited_paths
+):
+    """
+    Breadth-first search for main paths over the CSR adjacency
+    
+    Each queued path is an entry holding its parent entry and last edge,
+    so extending a path appends one entry instead of copying the path.
+    Entries are consumed in creation order, which is the BFS queue order.
+    Written over plain sequences so numba can compile it. The start
+    address must have at least one outgoing edge.
+    
+    visited_paths must be an empty mapping; it interns the path signatures
+    as (parent signature, hash id) -> id. Numba cannot infer the type of an
+    empty dict built inside the kernel, so the caller creates it.
+    
+    Returns:
+        (parent entry of each entry, last edge of each entry, total amount
+        of each entry, entries accepted as paths in BFS order)
+    """
+    first = edge_ids[indptr[start]]
+    parent = [-1]
+    edge = [first]
+    depth = [1]
+    parent_sig = [-1]
+    total = [amounts[first]]
+    
+    # Initialize with outgoing transactions from start address
+    for k in range(indptr[start] + 1, indptr[start + 1]):
+        edge_id = edge_ids[k]
+        parent.append(-1)
+        edge.append(edge_id)
+        depth.append(1)
+        parent_sig.append(-1)
+        total.append(amounts[edge_id])
+    
+    found = np.empty(max_paths, np.int64)
+    n_found = 0
+    head = 0
+    
+    while head < len(edge) and n_found < max_paths:
+        entry = head
+        head += 1
+        
+        if depth[entry] >= max_hops:
+            found[n_found] = entry
+            n_found += 1
+            continue
+        
+        # Skip paths whose transaction hashes were already seen
+        sig_key = (parent_sig[entry], hash_ids[edge[entry]])
+        if sig_key in visited_paths:
+            continue
+        sig = len(visited_paths)
+        visited_paths[sig_key] = sig
+        
+        # If no more outgoing edges, this is an end path
+        current_to = edge_to[edge[entry]]
+        lo = indptr[current_to]
+        hi = indptr[current_to + 1]
+        if lo == hi:
+            if depth[entry] >= 2:  # Only keep paths with at least 2 hops
+                found[n_found] = entry
+                n_found += 1
+            continue
+        
+        # Extend path with next edges
+        for k in range(lo, hi):
+            next_edge = edge_ids[k]
+            next_to = edge_to[next_edge]
+            
+            # Avoid cycles: skip recipients already on the path
+            on_path = False
+            e = entry
+            while e != -1:
+                if edge_to[edge[e]] == next_to:
+                    on_path = True
+                    break
+                e = parent[e]
+            if on_path:
+                continue
+            
+            parent.append(entry)
+            edge.append(next_edge)
+            depth.append(depth[entry] + 1)
+            parent_sig.append(sig)
+            total.append(total[entry] + amounts[next_edge])
+    
+    return parent, edge, total, found[:n_found]
+
+
+def _main_paths_python(indptr, edge_ids, edge_to, hash_ids, amounts, start, max_paths, max_hops):
+    """Run _main_paths_kernel on plain lists, which index far faster than NumPy scalars"""
+    return _main_paths_kernel(
+        indptr.tolist(), edge_ids.tolist(), edge_to.tolist(), hash_ids.tolist(),
+        amounts.tolist(), start, max_paths, max_hops, {}
+    )
+
+
+# Compiled once per process (and cached on disk across processes)
+if njit is not None:
+    _main_paths_compiled = njit(cache=True)(_main_paths_kernel)
+    
+    def _main_paths(indptr, edge_ids, edge_to, hash_ids, amounts, start, max_paths, max_hops):
+        """Run the compiled _main_paths_kernel with a typed signature dict"""
+        visited_paths = typed.Dict.empty(
+            key_type=types.UniTuple(types.int64, 2), value_type=types.int64
+        )
+        return _main_paths_compiled(
+            indptr, edge_ids, edge_to, hash_ids, amounts, start, max_paths, max_hops,
+            visited_paths
+        )
+else:
+    _main_paths = _main_paths_python
+
+
 class GraphAnalyzer:
     """
     Analyze transaction graph structure and identify key paths
@@ -33,63 +155,87 @@ class GraphAnalyzer:
             start_address: Starting address for analysis
         
         Returns:
-            Graph structure with nodes and edges
+            Graph structure with nodes and edges. Node statistics are
+            column arrays indexed by node id (graph["nodes"]["index"]
+            maps each address to its id), edge fields are columns indexed
+            by edge id (transaction order) in graph["edges"], and the
+            adjacency is in CSR form over edge ids.
         """
         graph = {
             "nodes": {},
-            "edges": [],
-            "adjacency": defaultdict(list)
+            "edges": {},
+            "adjacency": {}
         }
         
         start_address = start_address.lower()
         
+        # ノードはアドレスごとの連番IDで管理し、統計は列ごとの配列に保持
+        node_index = {}
+        from_ids = []
+        to_ids = []
+        amounts = []
+        timestamps = []
+        raw_timestamps = []
+        hashes = []
+        hash_index = {}
+        
         for tx in transactions:
             from_addr = tx.get("from", "").lower()
             to_addr = tx.get("to", "").lower()
             
             # Add nodes
-            if from_addr not in graph["nodes"]:
-                graph["nodes"][from_addr] = {
-                    "address": from_addr,
-                    "incoming_count": 0,
-                    "outgoing_count": 0,
-                    "total_received": 0.0,
-                    "total_sent": 0.0
-                }
-            
-            if to_addr not in graph["nodes"]:
-                graph["nodes"][to_addr] = {
-                    "address": to_addr,
-                    "incoming_count": 0,
-                    "outgoing_count": 0,
-                    "total_received": 0.0,
-                    "total_sent": 0.0
-                }
+            from_ids.append(node_index.setdefault(from_addr, len(node_index)))
+            to_ids.append(node_index.setdefault(to_addr, len(node_index)))
             
-            # Update node statistics
             amount = tx.get("value", 0.0)
-            graph["nodes"][from_addr]["outgoing_count"] += 1
-            graph["nodes"][from_addr]["total_sent"] += amount
-            graph["nodes"][to_addr]["incoming_count"] += 1
-            graph["nodes"][to_addr]["total_received"] += amount
+            amounts.append(amount)
             
-            # Add edge
-            edge = {
-                "from": from_addr,
-                "to": to_addr,
-                "amount": amount,
-                "timestamp": tx.get("timestamp"),
-                "tx_hash": tx.get("hash")
-            }
-            graph["edges"].append(edge)
+            # Parse once here; naive UTC so explorer "Z" times compare with naive ones
+            ts = tx.get("timestamp")
+            if isinstance(ts, str) and ts:
+                ts = datetime.fromisoformat(ts.replace('Z', '+00:00'))
+            if isinstance(ts, datetime) and ts.tzinfo is not None:
+                ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+            timestamps.append(ts if isinstance(ts, datetime) else None)
             
-            # Build adjacency list
-            graph["adjacency"][from_addr].append({
-                "to": to_addr,
-                "amount": amount,
-                "timestamp": tx.get("timestamp"),
-                "tx_hash": tx.get("hash")
-            })
+            # Add edge
+            raw_timestamps.append(tx.get("timestamp"))
+            hashes.append(tx.get("hash"))
+            hash_index.setdefault(hashes[-1], len(hash_index))
+        
+        # Node statistics, summed per node id in one pass each
+        node_count = len(node_index)
+        from_ids = np.array(from_ids, dtype=np.intp)
+        to_ids = np.array(to_ids, dtype=np.intp)
+        amounts = np.array(amounts, dtype=np.float64)
+        graph["nodes"] = {
+            "index": node_index,
+            "address": list(node_index),
+            "incoming_count": np.bincount(to_ids, minlength=node_count).astype(np.int32),
+            "outgoing_count": np.bincount(from_ids, minlength=node_count).astype(np.int32),
+            "total_received": np.bincount(to_ids, weights=amounts, minlength=node_count),
+            "total_sent": np.bincount(from_ids, weights=amounts, minlength=node_count)
+        }
+        
+        graph["edges"] = {
+            "from": from_ids,
+            "to": to_ids,
+            "amount": amounts,
+            "timestamp": np.array(timestamps, dtype="datetime64[us]"),  # NaT if missing
+            "raw_timestamp": raw_timestamps,  # As given, for the path records
+            "tx_hash": hashes,
+            # Transactions with the same hash share one id
+            "hash_id": np.array([hash_index[h] for h in hashes], dtype=np.int64)
+        }
+        
+        # CSR adjacency: edge ids grouped by sender, in transaction order
+        indptr = np.zeros(node_count + 1, dtype=np.intp)
+        np.cumsum(graph["nodes"]["outgoing_count"], out=indptr[1:])
+        graph["adjacency"] = {
+            "indptr": indptr,
+            "edge_ids": np.argsort(from_ids, kind="stable"),
+            "edge_to": to_ids  # Recipient node id of each edge
+        }
         
         return graph
     
@@ -112,56 +258,45 @@ class GraphAnalyzer:
         Returns:
             List of paths (each path is list of transactions)
         """
-        start_address = start_address.lower()
-        adjacency = graph["adjacency"]
-        
-        if start_address not in adjacency:
+        nodes = graph["nodes"]
+        start_id = nodes["index"].get(start_address.lower())
+        if start_id is None or not nodes["outgoing_count"][start_id]:
             return []
         
-        # BFS to find paths
-        paths = []
-        queue = deque()
-        
-        # Initialize with outgoing transactions from start address
-        for edge in adjacency[start_address]:
-            queue.append([edge])
-        
-        visited_paths = set()
-        
-        while queue and len(paths) < max_paths:
-            path = queue.popleft()
-            
-            if len(path) >= max_hops:
-                paths.append(path)
-                continue
-            
-            current_to = path[-1]["to"]
-            
-            # Create path signature to avoid duplicates
-            path_sig = tuple(e["tx_hash"] for e in path)
-            if path_sig in visited_paths:
-                continue
-            visited_paths.add(path_sig)
-            
-            # If no more outgoing edges, this is an end path
-            if current_to not in adjacency or not adjacency[current_to]:
-                if len(path) >= 2:  # Only keep paths with at least 2 hops
-                    paths.append(path)
-                continue
-            
-            # Extend path with next edges
-            for next_edge in adjacency[current_to]:
-                # Avoid cycles
-                if any(e["to"] == next_edge["to"] for e in path):
-                    continue
-                
-                new_path = path + [next_edge]
-                queue.append(new_path)
+        edges = graph["edges"]
+        adjacency = graph["adjacency"]
+        parent, last_edge, totals, found = _main_paths(
+            adjacency["indptr"], adjacency["edge_ids"], adjacency["edge_to"],
+            edges["hash_id"], edges["amount"], start_id, max_paths, max_hops
+        )
         
         # Sort paths by total amount
-        paths.sort(key=lambda p: sum(e["amount"] for e in p), reverse=True)
+        found = sorted(found.tolist(), key=lambda entry: totals[entry], reverse=True)
         
-        return paths[:max_paths]
+        # Rebuild each path by walking its parent entries
+        paths = []
+        for entry in found:
+            path = []
+            while entry != -1:
+                path.append(last_edge[entry])
+                entry = parent[entry]
+            path.reverse()
+            paths.append(path)
+        
+        return [[self._edge_record(graph, edge_id) for edge_id in path] for path in paths]
+    
+    def _edge_record(self, graph: Dict[str, Any], edge_id: int) -> Dict[str, Any]:
+        """Build the transaction dict for one edge of a returned path"""
+        edges = graph["edges"]
+        addresses = graph["nodes"]["address"]
+        return {
+            "id": edge_id,
+            "from": addresses[edges["from"][edge_id]],
+            "to": addresses[edges["to"][edge_id]],
+            "amount": float(edges["amount"][edge_id]),
+            "timestamp": edges["raw_timestamp"][edge_id],
+            "tx_hash": edges["tx_hash"][edge_id]
+        }
     
     def identify_intermediaries(
         self,
@@ -191,12 +326,14 @@ class GraphAnalyzer:
     
     def calculate_path_statistics(
         self,
+        graph: Dict[str, Any],
         path: List[Dict[str, Any]]
     ) -> Dict[str, Any]:
         """
         Calculate statistics for a transaction path
         
         Args:
+            graph: Transaction graph
             path: Transaction path
         
         Returns:
@@ -205,33 +342,28 @@ class GraphAnalyzer:
         if not path:
             return {}
         
-        total_amount = sum(e["amount"] for e in path)
+        columns = graph["edges"]
+        edge_ids = np.fromiter((e["id"] for e in path), dtype=np.intp, count=len(path))
+        
+        total_amount = float(columns["amount"][edge_ids].sum())
         hop_count = len(path)
         
         # Calculate time span
-        timestamps = []
-        for edge in path:
-            ts = edge.get("timestamp")
-            if isinstance(ts, str):
-                ts = datetime.fromisoformat(ts.replace('Z', '+00:00'))
-            if ts:
-                timestamps.append(ts)
+        timestamps = columns["timestamp"][edge_ids]
+        timestamps = timestamps[~np.isnat(timestamps)]
         
         time_span_seconds = 0
-        if len(timestamps) >= 2:
-            time_span_seconds = (max(timestamps) - min(timestamps)).total_seconds()
+        if timestamps.size >= 2:
+            time_span_seconds = float((timestamps.max() - timestamps.min()) / np.timedelta64(1, "s"))
         
         # Get addresses involved
-        addresses = set()
-        for edge in path:
-            addresses.add(edge["from"])
-            addresses.add(edge["to"])
+        addresses = np.union1d(columns["from"][edge_ids], columns["to"][edge_ids])
         
         return {
             "total_amount": total_amount,
             "hop_count": hop_count,
             "time_span_seconds": time_span_seconds,
-            "addresses_count": len(addresses),
+            "addresses_count": addresses.size,
             "average_amount": total_amount / hop_count if hop_count > 0 else 0,
             "transactions": [e["tx_hash"] for e in path]
         }
@@ -251,25 +383,24 @@ class GraphAnalyzer:
         Returns:
             List of hub addresses with statistics
         """
-        hubs = []
-        
-        for addr, node_data in graph["nodes"].items():
-            degree = node_data["incoming_count"] + node_data["outgoing_count"]
-            
-            if degree >= threshold:
-                hubs.append({
-                    "address": addr,
-                    "degree": degree,
-                    "incoming_count": node_data["incoming_count"],
-                    "outgoing_count": node_data["outgoing_count"],
-                    "total_received": node_data["total_received"],
-                    "total_sent": node_data["total_sent"]
-                })
-        
-        # Sort by degree
-        hubs.sort(key=lambda h: h["degree"], reverse=True)
-        
-        return hubs
+        nodes = graph["nodes"]
+        degree = nodes["incoming_count"] + nodes["outgoing_count"]
+        hub_ids = np.flatnonzero(degree >= threshold)
+        
+        # Sort by degree (stable, so ties keep first-seen order)
+        hub_ids = hub_ids[np.argsort(-degree[hub_ids], kind="stable")]
+        
+        return [
+            {
+                "address": nodes["address"][i],
+                "degree": int(degree[i]),
+                "incoming_count": int(nodes["incoming_count"][i]),
+                "outgoing_count": int(nodes["outgoing_count"][i]),
+                "total_received": float(nodes["total_received"][i]),
+                "total_sent": float(nodes["total_sent"][i])
+            }
+            for i in hub_ids.tolist()
+        ]
     
     def analyze_flow_pattern(
         self,
@@ -301,7 +432,7 @@ class GraphAnalyzer:
         # Analyze each path
         path_analyses = []
         for path in main_paths:
-            path_analyses.append(self.calculate_path_statistics(path))
+            path_analyses.append(self.calculate_path_statistics(graph, path))
         
         # Determine flow pattern
         avg_hops = sum(p["hop_count"] for p in path_analyses) / len(path_analyses)
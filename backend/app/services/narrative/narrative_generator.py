@@ -391,7 +391,7 @@ class NarrativeGenerator:
             return ""
         
         path = main_paths[0]
-        path_stats = self.graph_analyzer.calculate_path_statistics(path)
+        path_stats = self.graph_analyzer.calculate_path_statistics(graph, path)
         
         total_amount = path_stats.get("total_amount", 0)
         hop_count = path_stats.get("hop_count", 0)
@@ -80,7 +80,9 @@ class EnhancedReportGenerator:
         
         if transactions:
             detected_patterns = self.pattern_matcher.detect_patterns(transactions, address)
-            detected_anomalies = self.anomaly_detector.detect_anomalies(transactions, address)
+            detected_anomalies = self.anomaly_detector.detect_anomalies(
+                transactions, address, language=language
+            )
             risk_assessment = self.risk_scorer.calculate_risk_score(
                 address=address,
                 transactions=transactions,
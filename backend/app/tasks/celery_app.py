@@ -8,7 +8,7 @@ celery_app = Celery(
     "metasleuth",
     broker=settings.REDIS_URL,
     backend=settings.REDIS_URL,
-    include=["app.tasks.report_tasks"]
+    include=["app.tasks.report_tasks", "app.tasks.sync_tasks"]
 )
 
 celery_app.conf.update(
@@ -0,0 +1,75 @@
+"""
+Celery tasks for blockchain history synchronisation
+"""
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional
+
+from sqlalchemy import create_engine
+
+from .celery_app import celery_app
+from app.core.config import settings
+from app.crud.transaction import copy_transactions, create_transaction_partitions
+from app.services.blockchain.dto import TxDTO
+from app.services.blockchain.etherscan import EtherscanClient
+
+logger = logging.getLogger(__name__)
+
+_sync_engine = None
+
+
+def _get_sync_engine():
+    """Lazily create the synchronous engine used by worker processes"""
+    global _sync_engine
+    if _sync_engine is None:
+        _sync_engine = create_engine(settings.SYNC_DATABASE_URL, pool_pre_ping=True)
+    return _sync_engine
+
+
+async def _fetch_history(address: str, max_pages: Optional[int]) -> List[TxDTO]:
+    """Fetch the full transaction history of an address"""
+    # Each task runs in its own event loop, so use a dedicated client
+    async with EtherscanClient() as client:
+        return await client.get_all_transaction_dtos(address, max_pages=max_pages)
+
+
+@celery_app.task(bind=True, name="sync_address_history")
+def sync_address_history_task(
+    self,
+    address: str,
+    max_pages: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Initial import of an address's transaction history
+    
+    Rows are streamed into PostgreSQL with COPY through a staging table;
+    transactions that are already stored are skipped.
+    
+    Args:
+        self: Celery task instance (bind=True)
+        address: Ethereum address
+        max_pages: Maximum number of pages to fetch
+    
+    Returns:
+        Dict containing the number of newly imported transactions
+    """
+    try:
+        logger.info(f"Starting history sync for {address}")
+        
+        transactions = asyncio.run(_fetch_history(address, max_pages))
+        
+        with _get_sync_engine().begin() as conn:
+            create_transaction_partitions(conn, transactions)
+            count = copy_transactions(conn, transactions)
+        
+        logger.info(f"History sync completed for {address}: {count} transactions")
+        
+        return {
+            "status": "success",
+            "address": address,
+            "transactions": count
+        }
+    
+    except Exception as e:
+        logger.error(f"Error syncing history for {address}: {str(e)}", exc_info=True)
+        raise
\ No newline at end of file
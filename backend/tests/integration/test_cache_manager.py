@@ -0,0 +1,140 @@
+"""
+Integration tests for cache managers
+キャッシュマネージャー統合テスト
+"""
+
+import pytest
+from app.services.cache.cache_manager import (
+    CacheManager, RedisCacheManager, cache_manager, cached
+)
+
+
+class TestCacheCleanup:
+    """Background cleanup lifecycle used by the app lifespan"""
+    
+    @pytest.mark.asyncio
+    async def test_memory_cleanup_start_stop(self):
+        """In-memory manager starts and stops its cleanup task"""
+        manager = CacheManager()
+        manager.start_cleanup()
+        assert manager._cleanup_task is not None
+        
+        await manager.stop_cleanup()
+        assert manager._cleanup_task is None
+    
+    @pytest.mark.asyncio
+    async def test_redis_cleanup_start_stop(self):
+        """Redis manager cleanup is a no-op that shuts down cleanly"""
+        # Clients connect lazily, so no Redis server is needed here
+        manager = RedisCacheManager(url="redis://localhost:6379/0")
+        manager.start_cleanup()
+        await manager.stop_cleanup()
+        assert manager._cleanup_task is None
+
+
+
+class TestCachedDecorator:
+    """Wrappers generated by @cached for plain signatures"""
+    
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        """Start every test with an empty shared cache"""
+        cache_manager.clear()
+        yield
+        cache_manager.clear()
+    
+    def test_keyword_and_positional_share_key(self):
+        """Positional, keyword and defaulted calls map to one entry"""
+        calls = []
+        
+        @cached(prefix="test_args")
+        def lookup(address, chain="ethereum"):
+            calls.append((address, chain))
+            return f"{chain}:{address}"
+        
+        assert lookup("0xabc") == "ethereum:0xabc"
+        assert lookup("0xabc", "ethereum") == "ethereum:0xabc"
+        assert lookup(address="0xabc", chain="ethereum") == "ethereum:0xabc"
+        assert lookup("0xabc", chain="polygon") == "polygon:0xabc"
+        assert calls == [("0xabc", "ethereum"), ("0xabc", "polygon")]
+    
+    def test_unless_skips_caching(self):
+        """Results matching unless are returned but not cached"""
+        calls = []
+        
+        @cached(prefix="test_unless", unless=lambda result: result == [])
+        def fetch(address):
+            calls.append(address)
+            return []
+        
+        assert fetch("0xabc") == []
+        assert fetch("0xabc") == []
+        assert len(calls) == 2
+    
+    def test_no_argument_function(self):
+        """Functions without parameters use one precomputed key"""
+        calls = []
+        
+        @cached(prefix="test_no_args")
+        def load():
+            calls.append(1)
+            return "value"
+        
+        assert load() == "value"
+        assert load() == "value"
+        assert len(calls) == 1
+    
+    def test_method_keyed_by_class(self):
+        """Instances of a class share entries; other classes do not"""
+        calls = []
+        
+        class Client:
+            @cached(prefix="test_method")
+            def status(self):
+                calls.append(type(self).__name__)
+                return type(self).__name__
+            
+            @cached(prefix="test_method_args")
+            def balance(self, address):
+                calls.append(address)
+                return address.upper()
+        
+        class OtherClient(Client):
+            pass
+        
+        assert Client().status() == "Client"
+        assert Client().status() == "Client"
+        assert OtherClient().status() == "OtherClient"
+        assert Client().balance("0xabc") == "0XABC"
+        assert Client().balance(address="0xabc") == "0XABC"
+        assert calls == ["Client", "OtherClient", "0xabc"]
+    
+    def test_builtin_parameter_names(self):
+        """Parameters named like builtins or wrapper locals are left intact"""
+        @cached(prefix="test_builtins")
+        def describe(type, repr, cache_key=None):
+            return f"{type}:{repr}:{cache_key}"
+        
+        assert describe("a", "b") == "a:b:None"
+        assert describe(type="a", repr="b") == "a:b:None"
+        
+        class Client:
+            @cached(prefix="test_builtins_method")
+            def describe(self, type):
+                return type
+        
+        assert Client().describe("erc20") == "erc20"
+    
+    @pytest.mark.asyncio
+    async def test_async_function(self):
+        """Coroutine functions are awaited and cached"""
+        calls = []
+        
+        @cached(prefix="test_async")
+        async def fetch(address, page=1):
+            calls.append((address, page))
+            return {"address": address, "page": page}
+        
+        assert await fetch("0xabc") == {"address": "0xabc", "page": 1}
+        assert await fetch(address="0xabc", page=1) == {"address": "0xabc", "page": 1}
+        assert calls == [("0xabc", 1)]
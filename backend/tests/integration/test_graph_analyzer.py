@@ -0,0 +1,56 @@
+"""
+Integration tests for the graph analyzer
+グラフアナライザー統合テスト
+"""
+
+import pytest
+from app.services.narrative import graph_analyzer
+from app.services.narrative.graph_analyzer import GraphAnalyzer
+
+
+class TestMainPaths:
+    """Main path search tests"""
+
+    @pytest.fixture
+    def graph(self):
+        """Graph with branching paths, a cycle and a repeated tx hash"""
+        transactions = [
+            {"hash": "0x1", "from": "0xaaa", "to": "0xbbb", "value": 5.0, "timestamp": "2024-01-01T10:00:00Z"},
+            {"hash": "0x2", "from": "0xaaa", "to": "0xccc", "value": 1.0, "timestamp": "2024-01-01T10:05:00Z"},
+            {"hash": "0x3", "from": "0xbbb", "to": "0xddd", "value": 4.0, "timestamp": "2024-01-01T11:00:00Z"},
+            {"hash": "0x4", "from": "0xccc", "to": "0xddd", "value": 0.5, "timestamp": "2024-01-01T11:05:00Z"},
+            {"hash": "0x5", "from": "0xddd", "to": "0xaaa", "value": 3.0, "timestamp": "2024-01-01T12:00:00Z"},
+            {"hash": "0x5", "from": "0xddd", "to": "0xeee", "value": 3.0, "timestamp": "2024-01-01T12:00:00Z"},
+            {"hash": "0x6", "from": "0xddd", "to": "0xfff", "value": 2.0, "timestamp": "2024-01-01T12:30:00Z"},
+        ]
+        return GraphAnalyzer().build_graph(transactions, "0xaaa")
+
+    def test_find_main_paths(self, graph):
+        """Test paths are found, sorted by total amount"""
+        paths = GraphAnalyzer().find_main_paths(graph, "0xaaa")
+
+        assert paths
+        assert [tx["from"] for tx in paths[0]] == ["0xaaa", "0xbbb", "0xddd"]
+        totals = [sum(tx["amount"] for tx in path) for path in paths]
+        assert totals == sorted(totals, reverse=True)
+
+    def test_compiled_kernel_matches_python(self, graph):
+        """Test the numba-compiled search returns the same paths as plain Python"""
+        pytest.importorskip("numba")
+
+        edges = graph["edges"]
+        adjacency = graph["adjacency"]
+        start_id = graph["nodes"]["index"]["0xaaa"]
+        args = (
+            adjacency["indptr"], adjacency["edge_ids"], adjacency["edge_to"],
+            edges["hash_id"], edges["amount"], start_id, 5, 10
+        )
+
+        assert graph_analyzer._main_paths is not graph_analyzer._main_paths_python
+        compiled = graph_analyzer._main_paths(*args)
+        python = graph_analyzer._main_paths_python(*args)
+
+        assert list(compiled[0]) == python[0]
+        assert list(compiled[1]) == python[1]
+        assert list(compiled[2]) == pytest.approx(python[2])
+        assert compiled[3].tolist() == python[3].tolist()
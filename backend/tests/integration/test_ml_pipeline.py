@@ -162,3 +162,46 @@ class TestMLPipeline:
         assert "risk_score" in risk_assessment
         assert "risk_level" in risk_assessment
         assert len(narrative) > 50  # Meaningful narrative length
+    
+    def test_circular_trading_with_chain_budget(self):
+        """Test cycles are still found when the layering walk runs out of budget"""
+        addresses = ["0xaaa"] + [f"0x{i:03x}" for i in range(1, 10)]
+        transactions = [
+            {
+                "hash": f"0xdense{i}",
+                "from": from_addr,
+                "to": to_addr,
+                "value": 1.0,
+                "timestamp": "2024-01-01T10:00:00Z"
+            }
+            for i, (from_addr, to_addr) in enumerate(
+                (a, b) for a in addresses for b in addresses if a != b
+            )
+        ]
+        
+        matcher = PatternMatcher()
+        matcher.MAX_CHAIN_EXPANSIONS = 50
+        patterns = matcher.detect_patterns(transactions, "0xaaa")
+        
+        assert "circular_trading" in [pattern["pattern_id"] for pattern in patterns]
+    
+    def test_pattern_cache_keys_on_values(self):
+        """Test cached results are not shared by lists that only share hashes"""
+        transactions = [
+            {
+                "hash": f"0xsmurf{i}",
+                "from": "0xaaa",
+                "to": f"0x{i:03x}",
+                "value": 0.5,
+                "timestamp": f"2024-01-01T10:{i:02d}:00Z"
+            }
+            for i in range(12)
+        ]
+        scaled = [{**tx, "value": tx["value"] * 100} for tx in transactions]
+        
+        matcher = PatternMatcher()
+        small = matcher.detect_patterns(transactions, "0xaaa")
+        large = matcher.detect_patterns(scaled, "0xaaa")
+        
+        assert "smurfing" in [pattern["pattern_id"] for pattern in small]
+        assert "smurfing" not in [pattern["pattern_id"] for pattern in large]
@@ -0,0 +1,107 @@
+"""
+Integration tests for the COPY-based transaction import
+COPY によるトランザクション一括投入の統合テスト
+"""
+
+import os
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.crud.transaction import _copy_field, copy_transactions, create_transaction_partitions
+from app.models.investigation import Transaction
+from app.services.blockchain.dto import TxDTO
+
+
+def _tx(tx_hash: str, timestamp: datetime, value_wei: str = "1500000000000000000") -> TxDTO:
+    """Build a DTO the way the Etherscan client does"""
+    return TxDTO.from_dict(
+        {
+            "hash": tx_hash,
+            "from": "0xaaa",
+            "to": "0xbbb",
+            "value_wei": value_wei,
+            "block_number": 1,
+            "gas_used": 21000,
+            "gas_price": 20.0,
+            "timestamp": timestamp,
+        },
+        "ethereum",
+    )
+
+
+class TestCopyEncoding:
+    """COPY text-format field encoding"""
+
+    def test_escapes_special_characters(self):
+        """Tab, newline, carriage return and backslash are escaped"""
+        assert _copy_field("a\tb") == "a\\tb"
+        assert _copy_field("a\nb") == "a\\nb"
+        assert _copy_field("a\rb") == "a\\rb"
+        assert _copy_field("a\\b") == "a\\\\b"
+        assert _copy_field("\\t") == "\\\\t"
+
+    def test_none_is_null(self):
+        """None becomes the \\N null marker"""
+        assert _copy_field(None) == "\\N"
+
+    def test_booleans(self):
+        """Booleans use PostgreSQL's t/f literals"""
+        assert _copy_field(True) == "t"
+        assert _copy_field(False) == "f"
+
+    def test_numbers_and_timestamps(self):
+        """Decimals keep their exact text; datetimes use ISO format"""
+        assert _copy_field(Decimal("0E-18")) == "0E-18"
+        assert _copy_field(_tx("0x1", datetime(2024, 1, 1), "0").value) == "0E-18"
+        assert _copy_field(_tx("0x1", datetime(2024, 1, 1), "1").value) == "1E-18"
+        assert _copy_field(21000) == "21000"
+        assert _copy_field(datetime(2024, 1, 1, 10, 30)) == "2024-01-01T10:30:00"
+
+
+class TestCopyTransactions:
+    """Staging-table COPY against PostgreSQL (set TEST_DATABASE_URL to run)"""
+
+    @pytest.fixture
+    def connection(self):
+        """Connection inside a transaction that is rolled back afterwards"""
+        url = os.environ.get("TEST_DATABASE_URL")
+        if not url:
+            pytest.skip("TEST_DATABASE_URL is not set")
+
+        engine = create_engine(url)
+        with engine.connect() as conn:
+            trans = conn.begin()
+            conn.execute(text("CREATE SCHEMA test_transaction_copy"))
+            conn.execute(text("SET LOCAL search_path TO test_transaction_copy"))
+            Transaction.__table__.create(conn)
+            try:
+                yield conn
+            finally:
+                trans.rollback()
+        engine.dispose()
+
+    def test_skips_existing_and_duplicate_rows(self, connection):
+        """Rows already stored or repeated in the input are skipped"""
+        first = [_tx("0x1", datetime(2024, 3, 5)), _tx("0x2", datetime(2024, 3, 6), "0")]
+        create_transaction_partitions(connection, first)
+        assert copy_transactions(connection, first) == 2
+
+        second = [
+            _tx("0x2", datetime(2024, 3, 6), "0"),
+            _tx("0x3\tx", datetime(2024, 4, 1)),
+            _tx("0x3\tx", datetime(2024, 4, 1)),
+        ]
+        create_transaction_partitions(connection, second)
+        assert copy_transactions(connection, second) == 1
+
+        rows = connection.execute(text(
+            "SELECT tableoid::regclass::text, tx_hash, value FROM transactions ORDER BY tx_hash"
+        )).all()
+        assert rows == [
+            ("transactions_2024_03", "0x1", Decimal("1.5")),
+            ("transactions_2024_03", "0x2", Decimal("0")),
+            ("transactions_2024_04", "0x3\tx", Decimal("1.5")),
+        ]